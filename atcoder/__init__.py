@@ -1,25 +1,43 @@
 from atcoder.sample import Sample
 from atcoder.internal_bit import ceil_pow2, bsf
-from atcoder.lazysegtree import LazySegTree
+from atcoder.lazysegtree import LazySegTree, ValueLazySegTree, \
+    AddSumLazySegTree, AddMinLazySegTree, AddMaxLazySegTree, \
+    AssignSumLazySegTree, AssignMinLazySegTree, AssignMaxLazySegTree, \
+    AffineSumLazySegTree
 from atcoder.internal_math import is_prime, inv_gcd, primitive_root
-from atcoder.convolution import Convolution
+from atcoder.convolution import Convolution, PreparedKernel, \
+    OnlineConvolution, convolution_ll, convolution_any_mod
+from atcoder.fps import FPS
 from atcoder.maxflow import MaxFlow
 from atcoder.math_acl import inv_mod, crt, floor_sum
 from atcoder.string import sa_naive, sa_doubling, sa_is, suffix_array, \
     lcp_array, z_algorithm
 from atcoder.internal_csr import Csr
 from atcoder.mincostflow import MinCostFlow
-from atcoder.segtree import SegTree
-from atcoder.fenwicktree import FenwickTree
+from atcoder.segtree import SegTree, SumSegTree, MinSegTree, MaxSegTree
+from atcoder.dynamic_segtree import DynamicSegTree
+from atcoder.persistent_segtree import PersistentSegTree
+from atcoder.segtree_beats import SegTreeBeats
+from atcoder.set_convolution import SetConvolution
+from atcoder.sweep import rectangle_union_area, max_overlap
+from atcoder.fenwicktree import FenwickTree, FenwickTree2D, \
+    CompressedFenwickTree2D, RangeFenwickTree, FenwickMultiset
 from atcoder.internal_scc import InternalScc
 from atcoder.scc import Scc
 from atcoder.dsu import DSU
 
 
 __all__ = [
-    'Sample', 'ceil_pow2', 'bsf', 'LazySegTree', 'is_prime', 'inv_gcd',
-    'primitive_root', 'Convolution', 'MaxFlow', 'inv_mod', 'crt', 'floor_sum',
-    'Csr', 'MinCostFlow', 'SegTree', 'FenwickTree', 'DSU',
-    'sa_naive', 'sa_doubling', 'sa_is', 'suffix_array', 'lcp_array',
-    'z_algorithm', 'InternalScc', 'Scc',
+    'Sample', 'ceil_pow2', 'bsf', 'LazySegTree', 'ValueLazySegTree',
+    'AddSumLazySegTree', 'AddMinLazySegTree', 'AddMaxLazySegTree',
+    'AssignSumLazySegTree', 'AssignMinLazySegTree', 'AssignMaxLazySegTree',
+    'AffineSumLazySegTree', 'is_prime', 'inv_gcd', 'primitive_root',
+    'Convolution', 'PreparedKernel', 'OnlineConvolution', 'convolution_ll',
+    'convolution_any_mod', 'FPS', 'MaxFlow', 'inv_mod', 'crt', 'floor_sum',
+    'Csr', 'MinCostFlow', 'SegTree', 'SumSegTree', 'MinSegTree', 'MaxSegTree',
+    'DynamicSegTree', 'PersistentSegTree', 'SegTreeBeats', 'FenwickTree',
+    'FenwickTree2D', 'CompressedFenwickTree2D', 'RangeFenwickTree',
+    'FenwickMultiset', 'DSU', 'SetConvolution', 'rectangle_union_area',
+    'max_overlap', 'sa_naive', 'sa_doubling', 'sa_is', 'suffix_array',
+    'lcp_array', 'z_algorithm', 'InternalScc', 'Scc',
 ]
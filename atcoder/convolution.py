@@ -1,6 +1,116 @@
 from atcoder.internal_math import primitive_root
 from atcoder.internal_bit import ceil_pow2, bsf
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class _RootTable:
+    """
+    法modに対するバタフライ演算の回転因子のテーブル。
+    法ごとにプロセス全体で1つだけ作成し、Convolutionのインスタンス間で共有する。
+
+    バタフライ演算の各段では、s番目のブロックに掛ける回転因子が
+    段によらず共通の列rate[s]の先頭2**(ph-1)個になる。
+    そのため、列を倍々に伸ばしていくだけで全ての段のテーブルを兼ねられる。
+
+    Parameters
+    ----------
+    mod : int
+        法
+
+    Attributes
+    ----------
+    _tables : dict
+        法をキー、_RootTableを値とする辞書（クラス属性）
+    mod : int
+        法
+    root : int
+        modの最小原始根
+    rank2 : int
+        mod - 1 を割り切る最大の2べきの指数
+        扱えるバタフライ演算の長さは2**rank2まで
+    rate : list
+        rate[s]はバタフライ演算のs番目のブロックに掛ける回転因子
+    irate : list
+        rateの各要素の逆元のリスト
+    rate_np : numpy.ndarray or None
+    irate_np : numpy.ndarray or None
+        rate, irateをNumPyの配列にしたもの。必要になった時点で作成する。
+    _es : list
+        _es[i]は1の原始2**(i+2)乗根
+    _ies : list
+        _esの各要素の逆元のリスト
+
+    Methods
+    -------
+    get(cls, mod)
+        法modに対するテーブルを返却する（クラスメソッド）
+        初めて呼ばれた法の場合はテーブルを作成して登録する。
+    reserve(self, h)
+        長さ2**hのバタフライ演算に必要な分までテーブルを伸ばす
+
+        Parameters
+        ----------
+        h : int
+            0 <= h <= self.rank2
+    reserve_np(self, h)
+        reserveに加え、rate_np, irate_npを作成する
+
+        Parameters
+        ----------
+        h : int
+            0 <= h <= self.rank2
+    """
+    _tables = {}
+
+    @classmethod
+    def get(cls, mod):
+        table = cls._tables.get(mod)
+        if table is None:
+            table = cls(mod)
+            cls._tables[mod] = table
+        return table
+
+    def __init__(self, mod):
+        self.mod = mod
+        self.root = primitive_root(mod)
+        self.rank2 = bsf(mod - 1)
+        self._es = [0] * 30
+        self._ies = [0] * 30
+        e = pow(self.root, (mod - 1) >> self.rank2, mod)
+        ie = pow(e, mod - 2, mod)
+        for i in range(self.rank2 - 1)[::-1]:
+            self._es[i] = e
+            self._ies[i] = ie
+            e = e * e % mod
+            ie = ie * ie % mod
+
+        self.rate = [1]
+        self.irate = [1]
+        self.rate_np = None
+        self.irate_np = None
+
+    def reserve(self, h):
+        assert h <= self.rank2
+        mod = self.mod
+        while 2 * len(self.rate) < 1 << h:
+            k = len(self.rate).bit_length() - 1
+            e = self._es[k]
+            ie = self._ies[k]
+            self.rate += [x * e % mod for x in self.rate]
+            self.irate += [x * ie % mod for x in self.irate]
+            self.rate_np = None
+            self.irate_np = None
+
+    def reserve_np(self, h):
+        self.reserve(h)
+        if self.rate_np is None or len(self.rate_np) < len(self.rate):
+            self.rate_np = np.array(self.rate, dtype=np.int64)
+            self.irate_np = np.array(self.irate, dtype=np.int64)
+
 
 class Convolution:
     """
@@ -8,6 +118,23 @@ class Convolution:
     長さNの数列Aと長さMの数列Bから、長さ(N+M-1)の数列Cを計算する。
     c_i = sum_{j=0}^{i} a_j * b_{i-j}
 
+    NumPyがインストールされていて、かつ mod < 2**31 の場合は
+    NumPyによるバタフライ演算を用いる。
+    (積が int64 に収まるため、各段の演算を配列演算としてそのまま計算できる)
+    それ以外の場合は純Pythonの実装で計算する。
+
+    convolutionは配列の長さに応じて以下の方法を使い分ける。
+    (閾値はmod = 998244353で計測した結果から決めている)
+    - min(N, M) <= _NAIVE_THRESHOLD の場合は愚直な計算
+    - NumPyを用いる場合は min(N, M) > _NP_MIN_THRESHOLD かつ
+      N + M > _NP_SUM_THRESHOLD の場合にNumPyによるNTT
+    - NumPyを用いない場合は min(N, M) > _NTT_THRESHOLD の場合に純PythonのNTT
+    - それ以外の場合はKronecker置換
+      (各配列を1つの多倍長整数に詰めて、Pythonの多倍長整数の積で計算する)
+
+    回転因子のテーブルは法ごとに1度だけ作成され、
+    同じ法のインスタンス間で共有される。
+
     Parameters
     ----------
     mod : int
@@ -15,37 +142,246 @@ class Convolution:
 
     Attributes
     ----------
-    _first1 : bool
-        butterfly関数を初めて呼び出したかどうかを表すbool値
-    _first2 : bool
-        butterfly_inv関数を初めて呼び出したかどうかを表すbool値
-    _sum_e : list
-    _sum_ie : list
-        _sum_eの逆元のリスト
     _mod : int
         畳み込みを計算する際の法
     _root : int
         _modの最小原始根
+    _table : _RootTable
+        _modに対する回転因子のテーブル
+    _use_np : bool
+        NumPyによるバタフライ演算を用いるかどうかを表すbool値
+    _buf1 : list
+    _buf2 : list
+        純PythonのNTTで使い回す作業領域
+    _NAIVE_THRESHOLD : int
+    _NP_MIN_THRESHOLD : int
+    _NP_SUM_THRESHOLD : int
+    _NTT_THRESHOLD : int
+        計算方法を切り替える配列の長さの閾値（クラス属性）
+    _BATCH_SIZE : int
+        convolve_manyで1度にまとめて変換する要素数の上限（クラス属性）
 
     Methods
     -------
     __init__(self, mod)
         初期化
-    _butterfly(self, a)
+    _butterfly(self, a, n=None)
         バタフライ演算を実行する
 
         Parameters
         ----------
         a : array_like
             バタフライ演算を施す配列
-    _butterfly_inv(self, a)
+        n : int
+            バタフライ演算を施す長さ（2べき）
+            Noneの場合はlen(a)、それ以外の場合はaの先頭n要素のみを対象とする
+    _butterfly_inv(self, a, n=None)
         バタフライ演算の逆演算を実行する
 
         Parameters
         ----------
         a : array_like
             バタフライ演算の逆演算を施す配列
-    convolution(self, a, b)
+        n : int
+            _butterflyと同様
+    _butterfly_np(self, a)
+        _butterflyをNumPyの配列演算で実行する
+        各段ごとに、ブロック単位の回転因子を配列として持ち一括で計算する。
+
+        Parameters
+        ----------
+        a : numpy.ndarray
+            バタフライ演算を施す配列 (dtype=int64, 長さは2べき)
+    _butterfly_inv_np(self, a)
+        _butterfly_invをNumPyの配列演算で実行する
+
+        Parameters
+        ----------
+        a : numpy.ndarray
+            バタフライ演算の逆演算を施す配列 (dtype=int64, 長さは2べき)
+    _ntt_np(self, a, z)
+    _ntt_list(self, a, z)
+        配列aを長さzまで0埋めしてバタフライ演算を施した結果を返却する
+        それぞれnumpy.ndarray, listで返却する。
+    _intt_np(self, fa, length)
+    _intt_list(self, fa, length)
+        faにバタフライ演算の逆演算を施し、1/len(fa)倍した結果の
+        先頭length要素をlistで返却する。faは書き換えられる。
+    _convolution_np(self, a, b, length=None)
+        NumPyによるバタフライ演算を用いて畳み込みを計算する
+
+        Parameters
+        ----------
+        a, b : array_like
+            畳み込みを計算する対象となる2つの配列
+            len(a), len(b) >= 1
+        length : int
+            結果の先頭length要素だけを返却する
+            Noneの場合はlen(a) + len(b) - 1
+
+        Returns
+        -------
+        list
+            配列a, bに対して畳み込みを計算した結果
+    _convolution_naive(self, a, b, length=None)
+        愚直に畳み込みを計算する
+    _convolution_kronecker(self, a, b, length=None)
+        Kronecker置換により畳み込みを計算する
+        各要素をmodで割った余りを、積の係数が収まるバイト幅で
+        1つの整数に詰めて掛け合わせ、同じバイト幅で切り出す。
+    _kronecker_width(self, n, m)
+        長さn, mの配列の畳み込みをKronecker置換で計算する際の
+        1要素あたりのバイト幅を返却する
+    _kronecker_pack(self, a, k)
+        配列aの各要素をmodで割った余りをkバイトずつ詰めた整数を返却する
+    _kronecker_unpack(self, c, length, k)
+        整数cからkバイトずつlength個の要素を切り出し、modで割った余りのリストを返却する
+    _scratch(self, z)
+        長さz以上の作業領域(_buf1, _buf2)を返却する
+        作業領域はインスタンスごとに保持し、これまでの最大の長さまで伸ばして使い回す。
+    _convolution_ntt(self, a, b, inplace=False, length=None)
+        純Pythonのバタフライ演算を用いて畳み込みを計算する
+
+        Parameters
+        ----------
+        a, b : array_like
+            畳み込みを計算する対象となる2つの配列
+            （_convolution_naive, _convolution_kroneckerも同様）
+            len(a), len(b) >= 1
+        inplace : bool
+            Trueの場合、a, bを作業領域として使う。a, bは書き換えられ、
+            aに結果を格納して返却する。
+            aとbが同じリストでもよい（その場合bは作業領域にコピーする）。
+            Falseの場合、作業領域に値をコピーして計算し、a, bは書き換えない。
+        length : int
+            _convolution_npと同様
+
+        Returns
+        -------
+        list
+            配列a, bに対して畳み込みを計算した結果
+    _cyclic_convolution_ntt(self, a, b, z)
+        長さzの巡回畳み込みをNTTで計算した結果を返却する
+        (c_i = sum_{j+k = i (mod z)} a_j * b_k)
+
+        Parameters
+        ----------
+        a, b : array_like
+            len(a), len(b) <= z
+        z : int
+            2べき
+    _engine(self, n, m)
+        長さn, mの配列の畳み込みの計算方法を返却する
+        'naive', 'kronecker', 'np', 'ntt'のいずれか
+    ntt(self, a, z=None)
+        配列aを長さzまで0埋めしてNTTを施した結果を返却する
+        要素の並びはバタフライ演算の出力順（ビット反転順）となるが、
+        同じ長さの変換結果同士の要素ごとの積をinttに渡すと
+        長さzの巡回畳み込みが得られる。
+
+        Parameters
+        ----------
+        a : array_like
+            変換する配列
+        z : int
+            変換長。2べきかつlen(a) <= zを満たす。
+            Noneの場合はlen(a)以上の最小の2べき
+
+        Returns
+        -------
+        list
+            変換結果
+    intt(self, a)
+        nttの逆変換を施した結果を返却する（1/len(a)倍まで含む）
+
+        Parameters
+        ----------
+        a : array_like
+            逆変換する配列。長さは2べき
+
+        Returns
+        -------
+        list
+            逆変換結果
+    prepare(self, b)
+        配列bをカーネルとするPreparedKernelを返却する
+
+        Parameters
+        ----------
+        b : array_like
+            カーネルとなる配列
+
+        Returns
+        -------
+        PreparedKernel
+    _stack_np(self, arrays, z)
+        配列の列arraysの各要素をmodで割った余りを、
+        長さzまで0埋めして積んだ2次元配列を返却する
+    convolve_many(self, pairs)
+        複数の配列の組それぞれについて畳み込みを計算した結果を返却する
+        NumPyを用いる場合は、変換長が等しい組をまとめて2次元配列に積み、
+        バタフライ演算を一括で実行する。
+        NumPyを用いない場合は、組ごとにconvolutionを呼び出す。
+
+        Parameters
+        ----------
+        pairs : iterable
+            畳み込みを計算する配列の組(a, b)を並べたもの
+
+        Returns
+        -------
+        list
+            i番目の要素はpairsのi番目の組に対してconvolutionを計算した結果
+    middle_product(self, a, b)
+        c_i = sum_{j=0}^{M-1} a_{i+j} * b_j (0 <= i <= N-M) を計算する
+        aとbを反転したものの畳み込みの、添字M-1～N-1の部分にあたる。
+        NTTで計算する場合の変換長は 2**ceil_pow2(N) で済む。
+
+        Parameters
+        ----------
+        a, b : array_like
+            1 <= len(b) <= len(a)
+
+        Returns
+        -------
+        list
+            長さ N-M+1 の配列c
+    cyclic_convolution(self, a, b, length)
+        長さlengthの巡回畳み込みを計算した結果の配列を返却する
+        c_i = sum_{j+k = i (mod length)} a_j * b_k
+        lengthが2べきでNTTで計算する大きさの場合は、変換長lengthのNTTで直接計算する。
+        それ以外の場合は畳み込みを計算してから折り返す。
+
+        Parameters
+        ----------
+        a, b : array_like
+            畳み込みを計算する対象となる2つの配列
+            長さはlengthを超えてもよい（添字をlengthで割った余りに加算する）
+        length : int
+            1 <= length
+
+        Returns
+        -------
+        list
+            長さlengthの配列c
+    convolution_2d(self, a, b)
+        2次元の畳み込みを計算した結果の配列を返却する
+        c[i][j] = sum a[i1][j1] * b[i - i1][j - j1]
+        各行を間隔を空けて1次元に並べ、1回の畳み込みで計算する。
+
+        Parameters
+        ----------
+        a : list[list]
+            N1 × N2 の2次元配列
+        b : list[list]
+            M1 × M2 の2次元配列
+
+        Returns
+        -------
+        list[list]
+            (N1 + M1 - 1) × (N2 + M2 - 1) の2次元配列
+            a, bのいずれかが空の場合は空のリスト
+    convolution(self, a, b, inplace=False, limit=None)
         畳み込みを計算した結果の配列を返却する
         a, bのいずれかの配列が空の場合は空のリストを返却する
 
@@ -53,6 +389,15 @@ class Convolution:
         ----------
         a, b : array_like
             畳み込みを計算する対象となる2つの配列
+        inplace : bool
+            Trueの場合、a, bをlistとして作業領域に使うことを許す。
+            (純PythonのNTTで計算する場合にa, bが書き換えられる)
+            aとbが同じリストでもよい（convolution(a, a, inplace=True)）。
+            Falseの場合、a, bは書き換えない。
+        limit : int
+            0 <= limit
+            指定された場合、結果の先頭limit要素だけを計算して返却する。
+            (a, bの先頭limit要素だけを用いるので、変換長も小さくなる)
 
         Returns
         -------
@@ -63,128 +408,689 @@ class Convolution:
     --------
     https://github.com/atcoder/ac-library/blob/master/document_ja/convolution.md
     """
+    _NAIVE_THRESHOLD = 8
+    _NP_MIN_THRESHOLD = 100
+    _NP_SUM_THRESHOLD = 1000
+    _NTT_THRESHOLD = 60000
+    _BATCH_SIZE = 1 << 22
+
     def __init__(self, mod):
-        self._first1 = True
-        self._first2 = True
-        self._sum_e = [0] * 30
-        self._sum_ie = [0] * 30
         self._mod = mod
-        self._root = primitive_root(mod)
+        self._table = _RootTable.get(mod)
+        self._root = self._table.root
+        self._use_np = np is not None and mod < 1 << 31
+        self._buf1 = []
+        self._buf2 = []
 
-    def _butterfly(self, a):
-        n = len(a)
+    def _butterfly(self, a, n=None):
+        if n is None:
+            n = len(a)
         h = ceil_pow2(n)
-        if self._first1:
-            self._first1 = False
-            es = [0] * 30
-            ies = [0] * 30
-            m = self._mod - 1
-            cnt2 = bsf(m)
-            e = pow(self._root, m >> cnt2, self._mod)
-            ie = pow(e, self._mod - 2, self._mod)
-            for i in range(cnt2 - 1)[::-1]:
-                es[i] = e
-                ies[i] = ie
-                e *= e
-                e %= self._mod
-                ie *= ie
-                ie %= self._mod
-
-            now = 1
-            for i in range(cnt2 - 1):
-                self._sum_e[i] = es[i] * now % self._mod
-                now *= ies[i]
-                now %= self._mod
-
+        mod = self._mod
+        self._table.reserve(h)
+        rate = self._table.rate
         for ph in range(1, h + 1):
             w = 1 << (ph - 1)
             p = 1 << (h - ph)
-            now = 1
             for s in range(w):
+                now = rate[s]
                 offset = s << (h - ph + 1)
-                for i in range(p):
-                    left = a[i + offset]
-                    right = a[i + offset + p] * now
-                    a[i + offset] = (left + right) % self._mod
-                    a[i + offset + p] = (left - right) % self._mod
+                for i in range(offset, offset + p):
+                    left = a[i]
+                    right = a[i + p] * now
+                    a[i] = (left + right) % mod
+                    a[i + p] = (left - right) % mod
 
-                now *= self._sum_e[bsf(~s)]
-                now %= self._mod
-
-    def _butterfly_inv(self, a):
-        n = len(a)
+    def _butterfly_inv(self, a, n=None):
+        if n is None:
+            n = len(a)
         h = ceil_pow2(n)
-        if self._first2:
-            self._first2 = False
-            es = [0] * 30
-            ies = [0] * 30
-            m = self._mod - 1
-            cnt2 = bsf(m)
-            e = pow(self._root, m >> cnt2, self._mod)
-            ie = pow(e, self._mod - 2, self._mod)
-            for i in range(cnt2 - 1)[::-1]:
-                es[i] = e
-                ies[i] = ie
-                e *= e
-                e %= self._mod
-                ie *= ie
-                ie %= self._mod
-
-            now = 1
-            for i in range(cnt2 - 1):
-                self._sum_ie[i] = ies[i] * now % self._mod
-                now *= es[i]
-                now %= self._mod
-
+        mod = self._mod
+        self._table.reserve(h)
+        irate = self._table.irate
         for ph in range(1, h + 1)[::-1]:
             w = 1 << (ph - 1)
             p = 1 << (h - ph)
-            inow = 1
             for s in range(w):
+                inow = irate[s]
                 offset = s << (h - ph + 1)
-                for i in range(p):
-                    left = a[i + offset]
-                    right = a[i + offset + p]
-                    a[i + offset] = (left + right) % self._mod
-                    a[i + offset + p] = (
-                        (self._mod + left - right) * inow % self._mod
-                    )
-                inow *= self._sum_ie[bsf(~s)]
-                inow %= self._mod
-
-    def convolution(self, a, b):
+                for i in range(offset, offset + p):
+                    left = a[i]
+                    right = a[i + p]
+                    a[i] = (left + right) % mod
+                    a[i + p] = (mod + left - right) * inow % mod
+
+    def _butterfly_np(self, a):
+        h = ceil_pow2(a.shape[-1])
+        mod = self._mod
+        self._table.reserve_np(h)
+        rate = self._table.rate_np
+        for ph in range(1, h + 1):
+            w = 1 << (ph - 1)
+            p = 1 << (h - ph)
+            x = a.reshape(a.shape[:-1] + (w, 2, p))
+            left = x[..., 0, :]
+            right = x[..., 1, :] * rate[:w, None] % mod
+            x[..., 0, :], x[..., 1, :] = (left + right) % mod, \
+                (left - right) % mod
+
+    def _butterfly_inv_np(self, a):
+        h = ceil_pow2(a.shape[-1])
+        mod = self._mod
+        self._table.reserve_np(h)
+        irate = self._table.irate_np
+        for ph in range(1, h + 1)[::-1]:
+            w = 1 << (ph - 1)
+            p = 1 << (h - ph)
+            x = a.reshape(a.shape[:-1] + (w, 2, p))
+            left = x[..., 0, :]
+            right = x[..., 1, :]
+            x[..., 0, :], x[..., 1, :] = (left + right) % mod, \
+                (left - right) % mod * irate[:w, None] % mod
+
+    def _ntt_np(self, a, z):
+        fa = np.zeros(z, dtype=np.int64)
+        fa[:len(a)] = [x % self._mod for x in a]
+        self._butterfly_np(fa)
+        return fa
+
+    def _intt_np(self, fa, length):
+        self._butterfly_inv_np(fa)
+        iz = pow(len(fa), self._mod - 2, self._mod)
+        return (fa[:length] * iz % self._mod).tolist()
+
+    def _ntt_list(self, a, z):
+        fa = [x % self._mod for x in a]
+        fa += [0] * (z - len(fa))
+        self._butterfly(fa)
+        return fa
+
+    def _intt_list(self, fa, length):
+        self._butterfly_inv(fa)
+        iz = pow(len(fa), self._mod - 2, self._mod)
+        return [fa[i] * iz % self._mod for i in range(length)]
+
+    def _convolution_np(self, a, b, length=None):
+        n = len(a)
+        m = len(b)
+        if length is None:
+            length = n + m - 1
+        z = 1 << ceil_pow2(n + m - 1)
+        fa = self._ntt_np(a, z)
+        fa *= self._ntt_np(b, z)
+        fa %= self._mod
+        return self._intt_np(fa, length)
+
+    def _convolution_naive(self, a, b, length=None):
         n = len(a)
         m = len(b)
+        if length is None:
+            length = n + m - 1
+        if n < m:
+            n, m = m, n
+            a, b = b, a
+
+        res = [0] * length
+        for i in range(min(n, length)):
+            for j in range(min(m, length - i)):
+                res[i + j] += a[i] * b[j]
+                res[i + j] %= self._mod
+
+        return res
+
+    def _kronecker_width(self, n, m):
+        return (min(n, m) * (self._mod - 1) ** 2).bit_length() // 8 + 1
+
+    def _kronecker_pack(self, a, k):
+        mod = self._mod
+        return int.from_bytes(
+            b''.join((x % mod).to_bytes(k, 'little') for x in a), 'little')
+
+    def _kronecker_unpack(self, c, length, k):
+        mod = self._mod
+        c = c.to_bytes(max(length * k, (c.bit_length() + 7) // 8), 'little')
+        return [
+            int.from_bytes(c[i:i + k], 'little') % mod
+            for i in range(0, length * k, k)
+        ]
+
+    def _convolution_kronecker(self, a, b, length=None):
+        n = len(a)
+        m = len(b)
+        if length is None:
+            length = n + m - 1
+        k = self._kronecker_width(n, m)
+        c = self._kronecker_pack(a, k) * self._kronecker_pack(b, k)
+        return self._kronecker_unpack(c, length, k)
+
+    def _scratch(self, z):
+        if len(self._buf1) < z:
+            self._buf1 += [0] * (z - len(self._buf1))
+            self._buf2 += [0] * (z - len(self._buf2))
+        return self._buf1, self._buf2
+
+    def _convolution_ntt(self, a, b, inplace=False, length=None):
+        n = len(a)
+        m = len(b)
+        mod = self._mod
+        if length is None:
+            length = n + m - 1
+        z = 1 << ceil_pow2(n + m - 1)
+        if inplace:
+            fa, fb = a, b
+            if a is b:
+                # 同じリストを2回書き換えないよう、bは作業領域にコピーする
+                fb = self._scratch(z)[1]
+                fb[:m] = b
+                fb[m:z] = [0] * (z - m)
+            else:
+                fb += [0] * (z - m)
+            fa += [0] * (z - n)
+        else:
+            fa, fb = self._scratch(z)
+            fa[:n] = a
+            fa[n:z] = [0] * (z - n)
+            fb[:m] = b
+            fb[m:z] = [0] * (z - m)
+        self._butterfly(fa, z)
+        self._butterfly(fb, z)
+        for i in range(z):
+            fa[i] = fa[i] * fb[i] % mod
+
+        self._butterfly_inv(fa, z)
+        iz = pow(z, mod - 2, mod)
+        if inplace:
+            del fa[length:]
+            for i in range(length):
+                fa[i] = fa[i] * iz % mod
+            return fa
+
+        return [fa[i] * iz % mod for i in range(length)]
+
+    def _cyclic_convolution_ntt(self, a, b, z):
+        mod = self._mod
+        if self._use_np:
+            fa = self._ntt_np(a, z)
+            fa *= self._ntt_np(b, z)
+            fa %= mod
+            return self._intt_np(fa, z)
+
+        fa = self._ntt_list(a, z)
+        fb = self._ntt_list(b, z)
+        for i in range(z):
+            fa[i] = fa[i] * fb[i] % mod
+        return self._intt_list(fa, z)
+
+    def _engine(self, n, m):
+        if min(n, m) <= self._NAIVE_THRESHOLD:
+            return 'naive'
+        if self._use_np:
+            if min(n, m) > self._NP_MIN_THRESHOLD \
+                    and n + m > self._NP_SUM_THRESHOLD:
+                return 'np'
+        elif min(n, m) > self._NTT_THRESHOLD:
+            return 'ntt'
+        return 'kronecker'
+
+    def ntt(self, a, z=None):
+        if z is None:
+            z = 1 << ceil_pow2(len(a))
+        assert len(a) <= z and z & (z - 1) == 0
+        if self._use_np:
+            return self._ntt_np(a, z).tolist()
+        return self._ntt_list(a, z)
+
+    def intt(self, a):
+        z = len(a)
+        assert z & (z - 1) == 0
+        if self._use_np:
+            fa = np.array([x % self._mod for x in a], dtype=np.int64)
+            return self._intt_np(fa, z)
+        return self._intt_list([x % self._mod for x in a], z)
+
+    def prepare(self, b):
+        return PreparedKernel(self, b)
+
+    def _stack_np(self, arrays, z):
+        lens = np.array([len(a) for a in arrays], dtype=np.int64)
+        flat = np.array(
+            [x % self._mod for a in arrays for x in a], dtype=np.int64)
+        rows = np.repeat(np.arange(len(arrays)), lens)
+        cols = np.arange(len(flat)) - np.repeat(np.cumsum(lens) - lens, lens)
+        fa = np.zeros((len(arrays), z), dtype=np.int64)
+        fa[rows, cols] = flat
+        return fa
+
+    def convolve_many(self, pairs):
+        pairs = list(pairs)
+        res = [None] * len(pairs)
+        groups = {}
+        for idx, (a, b) in enumerate(pairs):
+            n = len(a)
+            m = len(b)
+            if not self._use_np or min(n, m) <= self._NAIVE_THRESHOLD:
+                res[idx] = self.convolution(a, b)
+            else:
+                z = 1 << ceil_pow2(n + m - 1)
+                groups.setdefault(z, []).append(idx)
+
+        mod = self._mod
+        for z, idxs in groups.items():
+            rows = max(1, self._BATCH_SIZE // z)
+            for start in range(0, len(idxs), rows):
+                batch = idxs[start:start + rows]
+                fa = self._stack_np([pairs[idx][0] for idx in batch], z)
+                fb = self._stack_np([pairs[idx][1] for idx in batch], z)
+                self._butterfly_np(fa)
+                self._butterfly_np(fb)
+                fa *= fb
+                fa %= mod
+                self._butterfly_inv_np(fa)
+                fa *= pow(z, mod - 2, mod)
+                fa %= mod
+                for idx, c in zip(batch, fa.tolist()):
+                    a, b = pairs[idx]
+                    res[idx] = c[:len(a) + len(b) - 1]
+
+        return res
+
+    def middle_product(self, a, b):
+        n = len(a)
+        m = len(b)
+        assert 1 <= m <= n
+        engine = self._engine(n - m + 1, m)
+        if engine == 'naive':
+            mod = self._mod
+            return [
+                sum(a[i + j] * b[j] for j in range(m)) % mod
+                for i in range(n - m + 1)
+            ]
+        if engine == 'kronecker':
+            return self._convolution_kronecker(a, b[::-1], n)[m - 1:]
+
+        # 長さ2**ceil_pow2(n)の巡回畳み込みで、循環して混ざるのは
+        # 添字m-2以下だけなので、必要な添字m-1～n-1はそのまま取り出せる。
+        return self._cyclic_convolution_ntt(
+            a, b[::-1], 1 << ceil_pow2(n))[m - 1:n]
+
+    def cyclic_convolution(self, a, b, length):
+        assert 1 <= length
+        mod = self._mod
+        fa = [0] * length
+        fb = [0] * length
+        for i, x in enumerate(a):
+            fa[i % length] += x
+        for i, x in enumerate(b):
+            fb[i % length] += x
+        if length & (length - 1) == 0 \
+                and self._engine(length, length) in ('np', 'ntt') \
+                and ceil_pow2(length) <= self._table.rank2:
+            return self._cyclic_convolution_ntt(fa, fb, length)
+
+        c = self.convolution(fa, fb)
+        for i in range(length, len(c)):
+            c[i - length] += c[i]
+        return [x % mod for x in c[:length]]
+
+    def convolution_2d(self, a, b):
+        n1 = len(a)
+        m1 = len(b)
+        if n1*m1 == 0:
+            return []
+        n2 = len(a[0])
+        m2 = len(b[0])
+        if n2*m2 == 0:
+            return [[] for _ in range(n1 + m1 - 1)]
+
+        # 行の間にn2+m2-1列ぶんの間隔を空けて1次元に並べると、
+        # 1次元の畳み込みの結果がそのまま2次元の結果を行ごとに並べたものになる。
+        w = n2 + m2 - 1
+        fa = [0] * ((n1 - 1) * w + n2)
+        fb = [0] * ((m1 - 1) * w + m2)
+        for i, row in enumerate(a):
+            assert len(row) == n2
+            fa[i * w:i * w + n2] = row
+        for i, row in enumerate(b):
+            assert len(row) == m2
+            fb[i * w:i * w + m2] = row
+        c = self.convolution(fa, fb)
+        return [c[i * w:(i + 1) * w] for i in range(n1 + m1 - 1)]
+
+    def convolution(self, a, b, inplace=False, limit=None):
+        n = len(a)
+        m = len(b)
+        if limit is not None:
+            assert 0 <= limit
+            if n > limit:
+                a = a[:limit]
+                n = limit
+            if m > limit:
+                b = b[:limit]
+                m = limit
         if n*m == 0:
             return []
 
-        if min(n, m) <= 60:
-            if n < m:
-                n, m = m, n
-                a, b = b, a
+        length = n + m - 1
+        if limit is not None:
+            length = min(length, limit)
+        engine = self._engine(n, m)
+        if engine == 'naive':
+            return self._convolution_naive(a, b, length)
+        if engine == 'np':
+            return self._convolution_np(a, b, length)
+        if engine == 'ntt':
+            return self._convolution_ntt(a, b, inplace, length)
+        return self._convolution_kronecker(a, b, length)
+
+
+class PreparedKernel:
+    """
+    同じ配列（カーネル）と何度も畳み込みを計算するためのオブジェクト。
+    Convolution.prepareで作成する。
+
+    NTTで計算する場合、カーネルを変換した結果を変換長ごとに保持しておき、
+    2回目以降は相手の配列の変換と逆変換の2回だけで畳み込みを計算する。
+    Kronecker置換で計算する場合も、カーネルを詰めた整数をバイト幅ごとに保持する。
+
+    Parameters
+    ----------
+    conv : Convolution
+        畳み込みの計算に用いるConvolution
+    b : array_like
+        カーネルとなる配列
+
+    Attributes
+    ----------
+    _conv : Convolution
+        畳み込みの計算に用いるConvolution
+    _kernel : list
+        カーネルの各要素をmodで割った余りのリスト
+    _cache : dict
+        (計算方法, 変換長またはバイト幅)をキー、変換済みのカーネルを値とする辞書
+
+    Methods
+    -------
+    __init__(self, conv, b)
+        初期化
+    _transformed(self, engine, z)
+        変換済みのカーネルを返却する
+        保持していない場合は変換して保持する。
+    convolution(self, a)
+        配列aとカーネルの畳み込みを計算した結果の配列を返却する
+        Convolution.convolution(a, b)と同じ結果になる。
+
+        Parameters
+        ----------
+        a : array_like
+            畳み込みを計算する対象となる配列
 
-            res = [0] * (n + m - 1)
-            for i in range(n):
-                for j in range(m):
-                    res[i + j] += a[i] * b[j]
-                    res[i + j] %= self._mod
+        Returns
+        -------
+        list
+            配列aとカーネルの畳み込みを計算した結果
+    """
+    def __init__(self, conv, b):
+        self._conv = conv
+        self._kernel = [x % conv._mod for x in b]
+        self._cache = {}
 
-            return res
+    def _transformed(self, engine, z):
+        key = (engine, z)
+        if key not in self._cache:
+            conv = self._conv
+            if engine == 'np':
+                self._cache[key] = conv._ntt_np(self._kernel, z)
+            elif engine == 'ntt':
+                self._cache[key] = conv._ntt_list(self._kernel, z)
+            else:
+                self._cache[key] = conv._kronecker_pack(self._kernel, z)
+        return self._cache[key]
+
+    def convolution(self, a):
+        conv = self._conv
+        n = len(a)
+        m = len(self._kernel)
+        if n*m == 0:
+            return []
+
+        engine = conv._engine(n, m)
+        if engine == 'naive':
+            return conv._convolution_naive(a, self._kernel)
+        if engine == 'kronecker':
+            k = conv._kronecker_width(n, m)
+            c = conv._kronecker_pack(a, k) * self._transformed(engine, k)
+            return conv._kronecker_unpack(c, n + m - 1, k)
 
         z = 1 << ceil_pow2(n + m - 1)
-        a += [0] * (z - n)
-        b += [0] * (z - m)
-        self._butterfly(a)
-        self._butterfly(b)
+        fb = self._transformed(engine, z)
+        if engine == 'np':
+            fa = conv._ntt_np(a, z)
+            fa *= fb
+            fa %= conv._mod
+            return conv._intt_np(fa, n + m - 1)
+
+        fa = conv._ntt_list(a, z)
         for i in range(z):
-            a[i] *= b[i]
-            a[i] %= self._mod
+            fa[i] = fa[i] * fb[i] % conv._mod
+        return conv._intt_list(fa, n + m - 1)
+
+
+class OnlineConvolution:
+    """
+    数列fの要素が1つずつ与えられるときに、
+    h_i = sum_{j=0}^{i} f_j * g_{i-j} をオンラインで計算する。
+    (gは最初から全て分かっているものとする)
+
+    f_iを追加した時点でh_iが確定する。
+    f_{i-s+1}, ..., f_iの長さsのブロックとg_s, ..., g_{2s-1}の畳み込みを
+    (i+1)がsで割り切れるときにまとめて計算することで、
+    N要素の追加全体でO(N(logN)^2)となる。
+    ただし g_1, ..., g_{_DIRECT-1} との積はf_iの追加時に直接加算する。
+
+    f_i = sum_{j=0}^{i-1} f_j * g_{i-j} の形の漸化式は、
+    g[1:]を渡してpush(f_i)の戻り値をf_{i+1}とすればよい。
+
+    Parameters
+    ----------
+    mod : int
+        畳み込みを計算する際の法
+    g : array_like
+        畳み込む相手の数列。範囲外の要素は0として扱う。
+
+    Attributes
+    ----------
+    _mod : int
+        法
+    _conv : Convolution
+        ブロックの畳み込みの計算に用いるConvolution
+    _g : list
+        gの各要素をmodで割った余りのリスト（長さ_DIRECT以上になるよう0埋め）
+    _f : list
+        これまでに追加されたfの要素のリスト
+    _h : list
+        _h[i]はh_iへの寄与のうち、計算済みのものの和
+    _DIRECT : int
+        直接加算するgの範囲（クラス属性）。2べき
+
+    Methods
+    -------
+    __init__(self, mod, g)
+        初期化
+    push(self, x)
+        fの末尾にxを追加し、h_iを返却する (i = 追加前の要素数)
+
+        Parameters
+        ----------
+        x : int
+            fに追加する要素
+
+        Returns
+        -------
+        int
+            h_iをmodで割った余り
+    """
+    _DIRECT = 32
+
+    def __init__(self, mod, g):
+        self._mod = mod
+        self._conv = Convolution(mod)
+        self._g = [x % mod for x in g]
+        self._g += [0] * (self._DIRECT - len(self._g))
+        self._f = []
+        self._h = []
+
+    def push(self, x):
+        mod = self._mod
+        f = self._f
+        g = self._g
+        h = self._h
+        i = len(f)
+        x %= mod
+        f.append(x)
+        n = i + 1
+        b = self._DIRECT
+        if len(h) < n + b:
+            h += [0] * (n + b - len(h))
+        h[n:n + b - 1] = [y + x * z for y, z in zip(h[n:n + b - 1], g[1:b])]
+
+        s = b
+        while n % s == 0 and s < len(g):
+            c = self._conv.convolution(f[n - s:], g[s:2 * s])
+            if len(h) < n + len(c):
+                h += [0] * (n + len(c) - len(h))
+            h[n:n + len(c)] = [y + z for y, z in zip(h[n:n + len(c)], c)]
+            s *= 2
+
+        return (h[i] + x * g[0]) % mod
+
+
+_MOD1 = 754974721  # 2**24 * 45 + 1
+_MOD2 = 167772161  # 2**25 * 5 + 1
+_MOD3 = 469762049  # 2**26 * 7 + 1
+_M1M2 = _MOD1 * _MOD2
+_M1M2M3 = _M1M2 * _MOD3
+_I1_2 = pow(_MOD1, _MOD2 - 2, _MOD2)
+_I12_3 = pow(_M1M2, _MOD3 - 2, _MOD3)
+
+
+def _convolution_three_primes(a, b):
+    """
+    3つのNTT-friendlyな素数(_MOD1, _MOD2, _MOD3)を法として畳み込みを計算する。
+
+    Parameters
+    ----------
+    a, b : array_like
+        畳み込みを計算する対象となる2つの配列
+        len(a) + len(b) - 1 <= 2**24
+
+    Returns
+    -------
+    (c1, c2, c3) : tuple
+        それぞれの法で畳み込みを計算した結果のリスト
+    """
+    assert len(a) + len(b) - 1 <= 1 << 24
+    return tuple(
+        Convolution(mod).convolution(a, b) for mod in (_MOD1, _MOD2, _MOD3)
+    )
+
+
+def _garner(r1, r2, r3):
+    """
+    x = r1 (mod _MOD1), x = r2 (mod _MOD2), x = r3 (mod _MOD3),
+    0 <= x < _MOD1 * _MOD2 * _MOD3 を満たすxを計算する。
+    math_acl.crtを3つの法に特化させたもの。
+
+    Parameters
+    ----------
+    r1, r2, r3 : int
+        0 <= r1 < _MOD1, 0 <= r2 < _MOD2, 0 <= r3 < _MOD3
+
+    Returns
+    -------
+    int
+        条件を満たすx
+    """
+    t2 = (r2 - r1) * _I1_2 % _MOD2
+    x = r1 + t2 * _MOD1
+    return x + (r3 - x) * _I12_3 % _MOD3 * _M1M2
+
+
+def convolution_ll(a, b):
+    """
+    整数列a, bの畳み込みを法を取らずに計算する。
+    3つの素数を法としてそれぞれ畳み込みを計算し、中国剰余定理で復元する。
+
+    Parameters
+    ----------
+    a, b : array_like
+        畳み込みを計算する対象となる2つの整数の配列
+        len(a) + len(b) - 1 <= 2**24
+        結果の各要素の絶対値は (754974721 * 167772161 * 469762049) / 2 未満
+
+    Returns
+    -------
+    list
+        配列a, bに対して畳み込みを計算した結果
+        a, bのいずれかの配列が空の場合は空のリスト
+    """
+    n = len(a)
+    m = len(b)
+    if n*m == 0:
+        return []
+
+    res = []
+    half = _M1M2M3 // 2
+    for r1, r2, r3 in zip(*_convolution_three_primes(a, b)):
+        x = _garner(r1, r2, r3)
+        if x > half:
+            x -= _M1M2M3
+        res.append(x)
+    return res
+
+
+def convolution_any_mod(a, b, mod):
+    """
+    任意の法modで畳み込みを計算する。
+    3つの素数を法としてそれぞれ畳み込みを計算し、中国剰余定理で復元する。
+
+    NumPyがインストールされていて、かつ mod < 2**31 の場合は
+    復元をNumPyの配列演算で行う。
+
+    Parameters
+    ----------
+    a, b : array_like
+        畳み込みを計算する対象となる2つの整数の配列
+        len(a) + len(b) - 1 <= 2**24
+    mod : int
+        1 <= mod
+        min(len(a), len(b)) * (mod - 1)**2
+        < 754974721 * 167772161 * 469762049
+
+    Returns
+    -------
+    list
+        配列a, bに対して畳み込みを計算した結果をmodで割った余り
+        a, bのいずれかの配列が空の場合は空のリスト
+    """
+    assert 1 <= mod
+    n = len(a)
+    m = len(b)
+    if n*m == 0:
+        return []
 
-        self._butterfly_inv(a)
-        a = a[:n + m - 1]
-        iz = pow(z, self._mod - 2, self._mod)
-        for i in range(n + m - 1):
-            a[i] *= iz
-            a[i] %= self._mod
+    a = [x % mod for x in a]
+    b = [x % mod for x in b]
+    c1, c2, c3 = _convolution_three_primes(a, b)
+    if np is None or mod >= 1 << 31:
+        return [_garner(r1, r2, r3) % mod for r1, r2, r3 in zip(c1, c2, c3)]
 
-        return a
+    r1 = np.array(c1, dtype=np.int64)
+    r2 = np.array(c2, dtype=np.int64)
+    r3 = np.array(c3, dtype=np.int64)
+    t2 = (r2 - r1) % _MOD2 * _I1_2 % _MOD2
+    t3 = ((r3 - r1) % _MOD3 - t2 * (_MOD1 % _MOD3) % _MOD3) % _MOD3 \
+        * _I12_3 % _MOD3
+    res = (r1 + t2 % mod * (_MOD1 % mod)) % mod
+    res += t3 % mod * (_M1M2 % mod) % mod
+    res %= mod
+    return res.tolist()
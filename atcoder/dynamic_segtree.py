@@ -0,0 +1,250 @@
+from array import array
+
+
+class DynamicSegTree:
+    """
+    動的セグメントツリー
+    管理する添字の範囲[lo, hi)が巨大な場合でも、座標圧縮をせずに用いることができる。
+    ノードは値が設定された位置の祖先だけを必要になった時点で作成する。
+    ノードはオブジェクトではなく、値と子の番号を並べた配列で管理する。
+    1回のsetで作成されるノードはO(log(hi - lo))個。
+
+    Parameters
+    ----------
+    モノイドの型をSとする。
+
+    op : function(S, S) -> S
+        S × S を計算する関数。
+    e : function() -> S
+        モノイドの初期値を返す関数。単位元。
+    lo : int
+    hi : int
+        lo <= hi
+        セグメントツリーで管理する添字の範囲[lo, hi)
+        要素は全てe()で初期化される。
+
+    Attributes
+    ----------
+    _lo : int
+    _hi : int
+        それぞれParametersを参照
+    _log : int
+        hi - lo <= 2**x を満たす最小のx
+    _d : list[S]
+        各ノードの値
+        _d[0]は空のノード（値はe()、子は自分自身）、_d[1]が根に当たる。
+    _left : array('q')
+    _right : array('q')
+        各ノードの左の子、右の子の番号。子がない場合は0
+    _op : function(S, S)
+    _e : function()
+        それぞれParametersを参照
+
+    Methods
+    -------
+    __init__(self, op, e, lo, hi)
+        初期化
+    _new_node(self)
+        値がe()で子のないノードを作成し、その番号を返却する
+    set(self, p, x)
+        p番目の要素をxで置き換える
+        Parameters
+        ----------
+        p : int
+            lo <= p < hi
+        x : S
+    get(self, p)
+        p番目の要素の取得
+        Parameters
+        ----------
+        p : int
+            lo <= p < hi
+        Returns
+        -------
+        S
+    prod(self, left, right)
+        left番目～right-1番目の要素の演算結果
+        Parameters
+        ----------
+        left : int
+        right : int
+            lo <= left <= right <= hi
+        Returns
+        -------
+        S
+            left==rightの場合はe()を返却する。
+    all_prod(self)
+        lo番目～hi-1番目の要素の演算結果
+    max_right(self, left, f)
+        SegTreeのmax_rightを参照
+        Parameters
+        ----------
+        left : int
+            lo <= left <= hi
+        f : function(S) -> bool
+            f(e()) == Trueを満たす
+        Returns
+        -------
+        int
+            fが単調だとすれば、
+            f(op(a[left], ..., a[r - 1])) = true となる最大のr
+    min_left(self, right, f)
+        SegTreeのmin_leftを参照
+        Parameters
+        ----------
+        right : int
+            lo <= right <= hi
+        f : function(S) -> bool
+            f(e()) == Trueを満たす
+        Returns
+        -------
+        int
+            fが単調だとすれば、
+            f(op(a[l], ..., a[right - 1])) = true となる最小のl
+    """
+    def __init__(self, op, e, lo, hi):
+        assert lo <= hi
+        self._lo = lo
+        self._hi = hi
+        self._log = (hi - lo - 1).bit_length() if hi > lo else 0
+        self._op = op
+        self._e = e
+        self._d = [e(), e()]
+        self._left = array('q', [0, 0])
+        self._right = array('q', [0, 0])
+
+    def _new_node(self):
+        self._d.append(self._e())
+        self._left.append(0)
+        self._right.append(0)
+        return len(self._d) - 1
+
+    def set(self, p, x):
+        assert self._lo <= p < self._hi
+        d = self._d
+        left = self._left
+        right = self._right
+        op = self._op
+        p -= self._lo
+        path = []
+        k = 1
+        for i in range(self._log - 1, -1, -1):
+            path.append(k)
+            if p >> i & 1:
+                if right[k] == 0:
+                    right[k] = self._new_node()
+                k = right[k]
+            else:
+                if left[k] == 0:
+                    left[k] = self._new_node()
+                k = left[k]
+        d[k] = x
+        for k in reversed(path):
+            d[k] = op(d[left[k]], d[right[k]])
+
+    def get(self, p):
+        assert self._lo <= p < self._hi
+        left = self._left
+        right = self._right
+        p -= self._lo
+        k = 1
+        for i in range(self._log - 1, -1, -1):
+            k = right[k] if p >> i & 1 else left[k]
+            if k == 0:
+                break
+        return self._d[k]
+
+    def prod(self, left, right):
+        assert self._lo <= left <= right <= self._hi
+        d = self._d
+        lch = self._left
+        rch = self._right
+        op = self._op
+        left -= self._lo
+        right -= self._lo
+        sm = self._e()
+        stack = [(1, 0, 1 << self._log)]
+        while stack:
+            k, a, w = stack.pop()
+            if k == 0 or right <= a or a + w <= left:
+                continue
+            if left <= a and a + w <= right:
+                sm = op(sm, d[k])
+                continue
+            w >>= 1
+            stack.append((rch[k], a + w, w))
+            stack.append((lch[k], a, w))
+        return sm
+
+    def all_prod(self):
+        return self._d[1]
+
+    def max_right(self, left, f):
+        assert self._lo <= left <= self._hi
+        assert f(self._e())
+        if left == self._hi:
+            return self._hi
+        d = self._d
+        lch = self._left
+        rch = self._right
+        op = self._op
+        left -= self._lo
+        sm = self._e()
+        stack = [(1, 0, 1 << self._log)]
+        while stack:
+            k, a, w = stack.pop()
+            if a + w <= left:
+                continue
+            if a < left:
+                w >>= 1
+                stack.append((rch[k], a + w, w))
+                stack.append((lch[k], a, w))
+                continue
+            if f(op(sm, d[k])):
+                sm = op(sm, d[k])
+                continue
+            while w > 1:
+                w >>= 1
+                if f(op(sm, d[lch[k]])):
+                    sm = op(sm, d[lch[k]])
+                    k = rch[k]
+                    a += w
+                else:
+                    k = lch[k]
+            return a + self._lo
+        return self._hi
+
+    def min_left(self, right, f):
+        assert self._lo <= right <= self._hi
+        assert f(self._e())
+        if right == self._lo:
+            return self._lo
+        d = self._d
+        lch = self._left
+        rch = self._right
+        op = self._op
+        right -= self._lo
+        sm = self._e()
+        stack = [(1, 0, 1 << self._log)]
+        while stack:
+            k, a, w = stack.pop()
+            if right <= a:
+                continue
+            if right < a + w:
+                w >>= 1
+                stack.append((lch[k], a, w))
+                stack.append((rch[k], a + w, w))
+                continue
+            if f(op(d[k], sm)):
+                sm = op(d[k], sm)
+                continue
+            while w > 1:
+                w >>= 1
+                if f(op(d[rch[k]], sm)):
+                    sm = op(d[rch[k]], sm)
+                    k = lch[k]
+                else:
+                    k = rch[k]
+                    a += w
+            return a + 1 + self._lo
+        return self._lo
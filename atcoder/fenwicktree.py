@@ -1,3 +1,7 @@
+from array import array
+from bisect import bisect_left
+
+
 class FenwickTree:
     """
     長さ N の配列に対し、
@@ -23,6 +27,15 @@ class FenwickTree:
     -------
     __init__(self, n=0)
         初期化
+    from_list(cls, v)
+        配列vを初期値とするFenwickTreeをO(N)で作成する（クラスメソッド）
+        Parameters
+        ----------
+        v : list[int]
+            初期値
+        Returns
+        -------
+        FenwickTree
     add(self, p, x)
         p番目の要素にxを加算する
         Parameters
@@ -43,12 +56,41 @@ class FenwickTree:
         Parameters
         ----------
         right : int
+    lower_bound(self, w)
+        sum(0, p + 1) >= w を満たす最小のpを、木を根から1度降りてO(logN)で求める
+        全ての要素が0以上である場合に限る
+        Parameters
+        ----------
+        w : int
+        Returns
+        -------
+        int
+            0 <= p <= self._n
+            w <= 0の場合は0、sum(0, self._n) < wの場合はself._n
+    kth(self, k)
+        各要素を個数とみなした多重集合で、小さい方からk番目(0-indexed)の
+        要素の番号を返却する（lower_bound(k + 1)と同じ）
+        Parameters
+        ----------
+        k : int
+            0 <= k
+        Returns
+        -------
+        int
+            要素の個数の合計がk以下の場合はself._n
     """
     def __init__(self, n=0):
         assert n >= 0
         self._n = n
         self._data = [0] * self._n
 
+    @classmethod
+    def from_list(cls, v):
+        fw = cls(0)
+        fw._n = len(v)
+        fw._data = _build(list(v))
+        return fw
+
     def add(self, p, x):
         assert 0 <= p < self._n
         p += 1
@@ -66,3 +108,430 @@ class FenwickTree:
             s += self._data[right - 1]
             right -= right & -right
         return s
+
+    def lower_bound(self, w):
+        data = self._data
+        n = self._n
+        x = 0
+        if w <= 0:
+            return 0
+        step = 1 << (n.bit_length() - 1) if n else 0
+        while step:
+            if x + step <= n and data[x + step - 1] < w:
+                x += step
+                w -= data[x - 1]
+            step >>= 1
+        return x
+
+    def kth(self, k):
+        assert 0 <= k
+        return self.lower_bound(k + 1)
+
+
+class FenwickTree2D:
+    """
+    H × W の2次元配列に対し、
+    ・要素の 1 点変更
+    ・長方形領域の要素の総和
+    を O(logH logW) で求めることが出来るデータ構造です。
+    H × W 個の値を1つのリストに並べて管理する。
+
+    Parameters
+    ----------
+    h : int
+    w : int
+        配列の大きさ
+
+    Attributes
+    ----------
+    _h : int
+    _w : int
+        配列の大きさ
+    _data : list[int]
+        管理する配列（(i, j)成分は_data[i * _w + j]）
+
+    Methods
+    -------
+    __init__(self, h=0, w=0)
+        初期化
+    add(self, x, y, v)
+        (x, y)成分にvを加算する
+        Parameters
+        ----------
+        x : int
+            0 <= x < self._h
+        y : int
+            0 <= y < self._w
+        v : int
+            加算する値
+    sum(self, x1, y1, x2, y2)
+        x1 <= x < x2, y1 <= y < y2 を満たす(x, y)成分の総和を計算する
+        Parameters
+        ----------
+        x1 : int
+        y1 : int
+        x2 : int
+        y2 : int
+            0 <= x1 <= x2 <= self._h, 0 <= y1 <= y2 <= self._w
+    _sum(self, x, y)
+        x' < x, y' < y を満たす(x', y')成分の総和を計算する
+    """
+    def __init__(self, h=0, w=0):
+        assert h >= 0 and w >= 0
+        self._h = h
+        self._w = w
+        self._data = [0] * (h * w)
+
+    def add(self, x, y, v):
+        assert 0 <= x < self._h and 0 <= y < self._w
+        data = self._data
+        h = self._h
+        w = self._w
+        x += 1
+        while x <= h:
+            base = (x - 1) * w - 1
+            j = y + 1
+            while j <= w:
+                data[base + j] += v
+                j += j & -j
+            x += x & -x
+
+    def sum(self, x1, y1, x2, y2):
+        assert 0 <= x1 <= x2 <= self._h and 0 <= y1 <= y2 <= self._w
+        return self._sum(x2, y2) - self._sum(x1, y2) \
+            - self._sum(x2, y1) + self._sum(x1, y1)
+
+    def _sum(self, x, y):
+        data = self._data
+        w = self._w
+        s = 0
+        while x > 0:
+            base = (x - 1) * w - 1
+            j = y
+            while j > 0:
+                s += data[base + j]
+                j -= j & -j
+            x -= x & -x
+        return s
+
+
+class CompressedFenwickTree2D:
+    """
+    値を加算する点の集合を先に与えることで、
+    ・点への値の加算
+    ・長方形領域の総和
+    を O(log^2 N) で求めることが出来るデータ構造です。(Nは点の数)
+    x座標についてのFenwickTreeの各ノードに、そのノードが担当する点のy座標の
+    FenwickTreeを持つ。メモリはO(N logN)で、座標の範囲によらない。
+
+    Parameters
+    ----------
+    xs : list[int]
+    ys : list[int]
+        値を加算する点の座標（(xs[i], ys[i])がi番目の点）
+        同じ点が複数回現れてもよい
+
+    Attributes
+    ----------
+    _xs : list[int]
+        点のx座標を重複なく昇順に並べたリスト
+    _ys : list[list[int]]
+        _ys[i]はx座標のFenwickTreeのノードi(1-indexed)が担当する点の
+        y座標を重複なく昇順に並べたリスト
+    _start : list[int]
+        ノードiのy座標のFenwickTreeは_data[_start[i]:_start[i + 1]]
+    _data : list[int]
+        全ノードのy座標のFenwickTreeを並べたリスト
+
+    Methods
+    -------
+    __init__(self, xs, ys)
+        初期化
+    add(self, x, y, v)
+        点(x, y)にvを加算する
+        Parameters
+        ----------
+        x : int
+        y : int
+            (x, y)は初期化時に与えた点のいずれか
+        v : int
+            加算する値
+    sum(self, x1, y1, x2, y2)
+        x1 <= x < x2, y1 <= y < y2 を満たす点の値の総和を計算する
+        Parameters
+        ----------
+        x1 : int
+        y1 : int
+        x2 : int
+        y2 : int
+            x1 <= x2, y1 <= y2 (座標は任意の整数)
+    _sum(self, x, y1, y2)
+        x' < x, y1 <= y' < y2 を満たす点の値の総和を計算する
+    """
+    def __init__(self, xs, ys):
+        assert len(xs) == len(ys)
+        self._xs = sorted(set(xs))
+        n = len(self._xs)
+        nodes = [set() for _ in range(n + 1)]
+        for x, y in zip(xs, ys):
+            i = bisect_left(self._xs, x) + 1
+            while i <= n:
+                nodes[i].add(y)
+                i += i & -i
+        self._ys = [sorted(s) for s in nodes]
+        self._start = [0] * (n + 2)
+        for i in range(n + 1):
+            self._start[i + 1] = self._start[i] + len(self._ys[i])
+        self._data = [0] * self._start[n + 1]
+
+    def add(self, x, y, v):
+        xs = self._xs
+        data = self._data
+        n = len(xs)
+        i = bisect_left(xs, x)
+        assert i < n and xs[i] == x
+        i += 1
+        while i <= n:
+            ys = self._ys[i]
+            m = len(ys)
+            j = bisect_left(ys, y)
+            assert j < m and ys[j] == y
+            base = self._start[i] - 1
+            j += 1
+            while j <= m:
+                data[base + j] += v
+                j += j & -j
+            i += i & -i
+
+    def sum(self, x1, y1, x2, y2):
+        assert x1 <= x2 and y1 <= y2
+        return self._sum(x2, y1, y2) - self._sum(x1, y1, y2)
+
+    def _sum(self, x, y1, y2):
+        data = self._data
+        s = 0
+        i = bisect_left(self._xs, x)
+        while i > 0:
+            ys = self._ys[i]
+            base = self._start[i] - 1
+            j = bisect_left(ys, y2)
+            while j > 0:
+                s += data[base + j]
+                j -= j & -j
+            j = bisect_left(ys, y1)
+            while j > 0:
+                s -= data[base + j]
+                j -= j & -j
+            i -= i & -i
+        return s
+
+
+def _build(data):
+    """
+    dataを初期値とするFenwickTreeの配列になるよう、dataをO(N)で書き換える。
+    各要素を、自身を含む最小の上位ノードに加える。
+
+    Parameters
+    ----------
+    data : list[int] or array('q')
+
+    Returns
+    -------
+    list[int] or array('q')
+        書き換えたdata
+    """
+    n = len(data)
+    for i in range(1, n + 1):
+        j = i + (i & -i)
+        if j <= n:
+            data[j - 1] += data[i - 1]
+    return data
+
+
+class RangeFenwickTree:
+    """
+    長さ N の配列に対し、
+    ・区間の要素への一様な加算
+    ・区間の要素の総和
+    を O(logN) で求めることが出来るデータ構造です。
+    2本のFenwickTreeを用いて、prefix sum(p) = sum1(p) * p + sum2(p) と表す。
+    各FenwickTreeはarray('q')に格納するため、
+    内部の値（区間和や加算値と添字の積）は -2**63 以上 2**63 未満でなければならない。
+    (範囲外の場合はOverflowErrorとなる)
+
+    Parameters
+    ----------
+    n : int
+        配列の長さ
+
+    Attributes
+    ----------
+    _n : int
+        配列の長さ
+    _data1 : array('q')
+        加算した値を管理するFenwickTree
+    _data2 : array('q')
+        補正項を管理するFenwickTree
+
+    Methods
+    -------
+    __init__(self, n=0)
+        初期化
+    from_list(cls, v)
+        配列vを初期値とするRangeFenwickTreeをO(N)で作成する（クラスメソッド）
+    add(self, left, right, x)
+        left番目～right-1番目の要素にxを加算する
+        Parameters
+        ----------
+        left : int
+        right : int
+            0 <= left <= right <= self._n
+        x : int
+            加算する値
+    sum(self, left, right)
+        left番目～right-1番目の要素の総和を計算する
+        Parameters
+        ----------
+        left : int
+        right : int
+            0 <= left <= right <= self._n
+    _add(self, data, p, x)
+        FenwickTree dataのp番目(0-indexed)にxを加算する
+    _sum(self, right)
+        0番目～right-1番目の要素の総和を計算する
+    """
+    def __init__(self, n=0):
+        assert n >= 0
+        self._n = n
+        self._data1 = array('q', [0]) * n
+        self._data2 = array('q', [0]) * n
+
+    @classmethod
+    def from_list(cls, v):
+        fw = cls(len(v))
+        fw._data2 = _build(array('q', v))
+        return fw
+
+    def _add(self, data, p, x):
+        p += 1
+        while p <= self._n:
+            data[p - 1] += x
+            p += p & -p
+
+    def add(self, left, right, x):
+        assert 0 <= left <= right <= self._n
+        self._add(self._data1, left, x)
+        self._add(self._data1, right, -x)
+        self._add(self._data2, left, -x * left)
+        self._add(self._data2, right, x * right)
+
+    def sum(self, left, right):
+        assert 0 <= left <= right <= self._n
+        return self._sum(right) - self._sum(left)
+
+    def _sum(self, right):
+        data1 = self._data1
+        data2 = self._data2
+        p = right
+        s1 = 0
+        s2 = 0
+        while p > 0:
+            s1 += data1[p - 1]
+            s2 += data2[p - 1]
+            p -= p & -p
+        return s1 * right + s2
+
+
+class FenwickMultiset:
+    """
+    取りうる値を先に与えることで、
+    ・値の追加・削除
+    ・ある値未満の要素の個数
+    ・小さい方からk番目の要素
+    を O(logN) で求めることが出来る多重集合です。
+    値を座標圧縮し、各値の個数をFenwickTreeで管理する。
+
+    Parameters
+    ----------
+    values : list
+        追加する可能性のある値（重複してもよい、比較可能であること）
+
+    Attributes
+    ----------
+    _values : list
+        valuesを重複なく昇順に並べたリスト
+    _index : dict
+        値から_valuesでの番号への辞書
+    _count : list[int]
+        各値の個数
+    _fw : FenwickTree
+        各値の個数を管理するFenwickTree
+    _size : int
+        要素の個数の合計
+
+    Methods
+    -------
+    __init__(self, values)
+        初期化（空の多重集合）
+    __len__(self)
+        要素の個数の合計を返却する
+    add(self, x, k=1)
+        xをk個追加する
+        Parameters
+        ----------
+        x : valuesに含まれる値
+        k : int
+            0 <= k
+    remove(self, x, k=1)
+        xをk個削除する
+        Parameters
+        ----------
+        x : valuesに含まれる値
+        k : int
+            0 <= k <= count(x)
+    count(self, x)
+        xの個数を返却する
+    count_less(self, x)
+        x未満の要素の個数を返却する（xはvaluesに含まれなくてもよい）
+    kth(self, k)
+        小さい方からk番目(0-indexed)の要素を返却する
+        Parameters
+        ----------
+        k : int
+            0 <= k < len(self)
+    """
+    def __init__(self, values):
+        self._values = sorted(set(values))
+        self._index = {x: i for i, x in enumerate(self._values)}
+        self._count = [0] * len(self._values)
+        self._fw = FenwickTree(len(self._values))
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, x, k=1):
+        assert x in self._index and 0 <= k
+        i = self._index[x]
+        self._count[i] += k
+        self._size += k
+        self._fw.add(i, k)
+
+    def remove(self, x, k=1):
+        assert x in self._index and 0 <= k
+        i = self._index[x]
+        assert k <= self._count[i]
+        self._count[i] -= k
+        self._size -= k
+        self._fw.add(i, -k)
+
+    def count(self, x):
+        i = self._index.get(x)
+        return 0 if i is None else self._count[i]
+
+    def count_less(self, x):
+        return self._fw._sum(bisect_left(self._values, x))
+
+    def kth(self, k):
+        assert 0 <= k < self._size
+        return self._values[self._fw.kth(k)]
@@ -0,0 +1,307 @@
+"""
+形式的冪級数（Formal Power Series）の演算詰め合わせ
+Convolutionを用いて、Newton法によりO(NlogN)で計算する。
+"""
+from atcoder.convolution import Convolution
+
+
+class FPS:
+    """
+    法modのもとでの形式的冪級数の演算を行う。
+    形式的冪級数は係数を次数の低い順に並べたリストで表す。
+
+    Parameters
+    ----------
+    mod : int
+        NTT-friendlyな素数
+        (998244353, 754974721, 469762049, 167772161など)
+
+    Attributes
+    ----------
+    _mod : int
+        法
+    _conv : Convolution
+        畳み込みの計算に用いるConvolution
+
+    Methods
+    -------
+    __init__(self, mod)
+        初期化
+    _mul(self, a, b, n)
+        a * b の先頭n項を返却する
+    _invs(self, n)
+        1, 2, ..., n のmodでの逆元のリストを返却する（先頭は0）
+    _diff(self, a)
+        aを微分した結果を返却する
+    _integral(self, a)
+        aを積分した結果を返却する（定数項は0）
+    inv(self, a, n=None)
+        1 / a の先頭n項を返却する
+
+        Parameters
+        ----------
+        a : list
+            a[0] != 0 (mod)
+        n : int
+            求める項数。Noneの場合はlen(a)
+
+        Returns
+        -------
+        list
+            1 / a の先頭n項
+    log(self, a, n=None)
+        log(a) の先頭n項を返却する
+
+        Parameters
+        ----------
+        a : list
+            a[0] == 1
+        n : int
+            求める項数。Noneの場合はlen(a)
+
+        Returns
+        -------
+        list
+            log(a) の先頭n項
+    exp(self, a, n=None)
+        exp(a) の先頭n項を返却する
+
+        Parameters
+        ----------
+        a : list
+            len(a) == 0 または a[0] == 0
+        n : int
+            求める項数。Noneの場合はlen(a)
+
+        Returns
+        -------
+        list
+            exp(a) の先頭n項
+    pow(self, a, k, n=None)
+        a ** k の先頭n項を返却する
+
+        Parameters
+        ----------
+        a : list
+        k : int
+            0 <= k
+        n : int
+            求める項数。Noneの場合はlen(a)
+
+        Returns
+        -------
+        list
+            a ** k の先頭n項
+    sqrt(self, a, n=None)
+        g * g == a を満たすgの先頭n項を返却する
+
+        Parameters
+        ----------
+        a : list
+        n : int
+            求める項数。Noneの場合はlen(a)
+
+        Returns
+        -------
+        list or None
+            gの先頭n項。存在しない場合はNone
+    divmod(self, f, g)
+        多項式f, gについて f = q * g + r, deg(r) < deg(g) を満たすq, rを返却する
+
+        Parameters
+        ----------
+        f : list
+        g : list
+            g[-1] != 0 (mod)
+
+        Returns
+        -------
+        (q, r) : tuple
+            len(q) == max(len(f) - len(g) + 1, 0)
+            len(r) == min(len(f), len(g) - 1)
+    """
+    def __init__(self, mod):
+        self._mod = mod
+        self._conv = Convolution(mod)
+
+    def _mul(self, a, b, n):
+        c = self._conv.convolution(a, b, limit=n)
+        return c + [0] * (n - len(c))
+
+    def _invs(self, n):
+        mod = self._mod
+        invs = [0, 1]
+        for i in range(2, n + 1):
+            invs.append(-(mod // i) * invs[mod % i] % mod)
+        return invs[:n + 1]
+
+    def _diff(self, a):
+        mod = self._mod
+        return [a[i] * i % mod for i in range(1, len(a))]
+
+    def _integral(self, a):
+        mod = self._mod
+        invs = self._invs(len(a))
+        return [0] + [a[i] * invs[i + 1] % mod for i in range(len(a))]
+
+    def inv(self, a, n=None):
+        if n is None:
+            n = len(a)
+        mod = self._mod
+        conv = self._conv
+        assert a and a[0] % mod != 0
+        g = [pow(a[0], mod - 2, mod)]
+        m = 1
+        while m < n:
+            # g * f = 1 + x^m * (...) なので、
+            # g <- g - g * (g * f - 1) の上位m項だけを計算すればよい。
+            fa = conv.ntt(a[:2 * m], 2 * m)
+            fg = conv.ntt(g, 2 * m)
+            h = conv.intt([x * y % mod for x, y in zip(fa, fg)])
+            h[:m] = [0] * m
+            fh = conv.ntt(h, 2 * m)
+            h = conv.intt([x * y % mod for x, y in zip(fh, fg)])
+            g += [-x % mod for x in h[m:]]
+            m *= 2
+        return g[:n]
+
+    def log(self, a, n=None):
+        if n is None:
+            n = len(a)
+        assert a and a[0] % self._mod == 1
+        if n == 0:
+            return []
+        return self._integral(
+            self._mul(self._diff(a[:n]), self.inv(a, n), n - 1))
+
+    def exp(self, a, n=None):
+        if n is None:
+            n = len(a)
+        mod = self._mod
+        assert not a or a[0] % mod == 0
+        g = [1]
+        m = 1
+        while m < n:
+            m *= 2
+            # g <- g * (1 - log(g) + a)
+            h = self.log(g, m)
+            h = [(x - y) % mod for x, y in zip(a[:m], h)] \
+                + [-y % mod for y in h[len(a):]]
+            h[0] = (h[0] + 1) % mod
+            g = self._mul(g, h, m)
+        return g[:n]
+
+    def pow(self, a, k, n=None):
+        if n is None:
+            n = len(a)
+        mod = self._mod
+        assert 0 <= k
+        if k == 0:
+            return [1 % mod] + [0] * (n - 1) if n else []
+
+        d = 0
+        while d < len(a) and a[d] % mod == 0:
+            d += 1
+        if d == len(a) or d * k >= n:
+            return [0] * n
+
+        m = n - d * k
+        c = a[d] % mod
+        ic = pow(c, mod - 2, mod)
+        b = [x * ic % mod for x in a[d:d + m]]
+        b = self.log(b + [0] * (m - len(b)), m)
+        b = self.exp([x * (k % mod) % mod for x in b], m)
+        ck = pow(c, k, mod)
+        return [0] * (d * k) + [x * ck % mod for x in b]
+
+    def sqrt(self, a, n=None):
+        if n is None:
+            n = len(a)
+        mod = self._mod
+        d = 0
+        while d < len(a) and a[d] % mod == 0:
+            d += 1
+        if d == len(a) or d >= 2 * n:
+            return [0] * n
+        if d % 2:
+            return None
+
+        c = _sqrt_mod(a[d] % mod, mod)
+        if c is None:
+            return None
+
+        m = n - d // 2
+        b = a[d:d + m]
+        inv2 = (mod + 1) // 2
+        g = [c]
+        k = 1
+        while k < m:
+            k *= 2
+            # g <- (g + b / g) / 2
+            h = self._mul(b, self.inv(g, k), k)
+            g += [0] * (k - len(g))
+            g = [(x + y) * inv2 % mod for x, y in zip(g, h + [0] * k)]
+        return [0] * (d // 2) + g[:m]
+
+    def divmod(self, f, g):
+        n = len(f)
+        m = len(g)
+        mod = self._mod
+        assert m and g[-1] % mod != 0
+        if n < m:
+            return [], [x % mod for x in f]
+
+        k = n - m + 1
+        q = self._mul(f[::-1], self.inv(g[::-1], k), k)[::-1]
+        if m == 1:
+            return q, []
+        qg = self._mul(q, g, m - 1)
+        r = [(x - y) % mod for x, y in zip(f[:m - 1], qg)]
+        return q, r
+
+
+def _sqrt_mod(a, p):
+    """
+    素数pを法としたときのaの平方根を計算する。(Tonelli-Shanks)
+
+    Parameters
+    ----------
+    a : int
+        0 <= a < p
+    p : int
+        素数
+
+    Returns
+    -------
+    int or None
+        x * x == a (mod p) を満たすx。存在しない場合はNone
+    """
+    if a == 0 or p == 2:
+        return a
+    if pow(a, (p - 1) // 2, p) != 1:
+        return None
+
+    q = p - 1
+    s = 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+
+    c = pow(z, q, p)
+    x = pow(a, (q + 1) // 2, p)
+    t = pow(a, q, p)
+    while t != 1:
+        i = 0
+        u = t
+        while u != 1:
+            u = u * u % p
+            i += 1
+        b = pow(c, 1 << (s - i - 1), p)
+        x = x * b % p
+        c = b * b % p
+        t = t * c % p
+        s = i
+    return x
@@ -1,3 +1,7 @@
+from array import array
+import operator
+
+
 class LazySegTree:
     """
     遅延評価セグメントツリー
@@ -42,6 +46,12 @@ class LazySegTree:
         セグメントツリーで管理する遅延要素（写像）を並べたリスト
         _lz[1]が根に当たり、_lz[x]の子は_lz[x*2]と_lz[x*2+1]になる。
         サイズが_dの半分（セグメントツリーの葉には対応する遅延要素はないため。）
+    _dirty : bytearray
+        _dirty[k]が1のとき、_lz[k]に恒等写像でない可能性のある写像が
+        積まれていることを表す。0のノードでは_pushを省略する。
+    _pushed : int
+    _skipped : int
+        _pushで子への引き継ぎを行った回数、省略した回数
     _op : function(S, S)
     _e : function()
     _mapping : function(F, S)
@@ -70,10 +80,16 @@ class LazySegTree:
         f : F
     _push(self, k)
         _lz[k]を子に引き継ぎ、_lz[k]を初期化する。
+        _dirty[k]が0の場合は何もしない。
         Parameters
         ----------
         k : int
             更新箇所
+    push_stats(self)
+        遅延要素の引き継ぎを行った回数と省略した回数を返却する
+        Returns
+        -------
+        (pushed, skipped) : tuple
     set(self, p, x)
         p番目の要素をxで置き換える
         その際、関連する遅延要素の反映、値の更新を行う。
@@ -107,6 +123,19 @@ class LazySegTree:
         S
             l番目～r-1番目の要素の演算結果
             l==rの場合はe()を返却する。
+    prod_many(self, lefts, rights)
+        各iについてprod(lefts[i], rights[i])を計算する
+        1回の呼び出しでまとめて処理し、単位元e()の呼び出しも1回にする。
+        Parameters
+        ----------
+        lefts : list[int]
+        rights : list[int]
+            len(lefts) == len(rights)
+            0 <= lefts[i] <= rights[i] <= self._n
+        Returns
+        -------
+        list[S]
+            各区間の演算結果
     all_prod(self)
         0番目～n-1番目の要素の演算結果
         Returns
@@ -175,6 +204,9 @@ class LazySegTree:
         self._size = 1 << self._log
         self._d = [e() for _ in range(2 * self._size)]
         self._lz = [id() for _ in range(self._size)]
+        self._dirty = bytearray(self._size)
+        self._pushed = 0
+        self._skipped = 0
         self._op = op
         self._e = e
         self._mapping = mapping
@@ -193,11 +225,20 @@ class LazySegTree:
         self._d[k] = self._mapping(f, self._d[k])
         if k < self._size:
             self._lz[k] = self._composition(f, self._lz[k])
+            self._dirty[k] = 1
 
     def _push(self, k):
+        if not self._dirty[k]:
+            self._skipped += 1
+            return
+        self._pushed += 1
         self._all_apply(2*k, self._lz[k])
         self._all_apply(2*k+1, self._lz[k])
         self._lz[k] = self._id()
+        self._dirty[k] = 0
+
+    def push_stats(self):
+        return self._pushed, self._skipped
 
     def set(self, p, x):
         assert (0 <= p) and (p < self._n)
@@ -243,6 +284,41 @@ class LazySegTree:
 
         return self._op(sml, smr)
 
+    def prod_many(self, lefts, rights):
+        assert len(lefts) == len(rights)
+        n = self._n
+        log = self._log
+        size = self._size
+        d = self._d
+        op = self._op
+        push = self._push
+        e = self._e()
+        res = []
+        for left, right in zip(lefts, rights):
+            assert 0 <= left <= right <= n
+            if left == right:
+                res.append(e)
+                continue
+            left += size
+            right += size
+            for i in range(log, 0, -1):
+                if ((left >> i) << i) != left:
+                    push(left >> i)
+                if ((right >> i) << i) != right:
+                    push(right >> i)
+            sml = smr = e
+            while left < right:
+                if left & 1:
+                    sml = op(sml, d[left])
+                    left += 1
+                if right & 1:
+                    right -= 1
+                    smr = op(d[right], smr)
+                left >>= 1
+                right >>= 1
+            res.append(op(sml, smr))
+        return res
+
     def all_prod(self):
         return self._d[1]
 
@@ -338,3 +414,804 @@ class LazySegTree:
             if(right & -right) == right:
                 break
         return 0
+
+
+class ValueLazySegTree(LazySegTree):
+    """
+    単位元eと恒等写像idを関数ではなく値として受け取る遅延評価セグメントツリー
+    e, idを呼び出して値を生成することはなく、同じオブジェクトを使い回す。
+    そのため、op, mapping, compositionは引数を書き換えてはならない。
+    遅延要素の伝播（_pushと_all_apply）は各メソッド内のループに展開し、
+    ローカル変数だけで処理する。
+
+    Parameters
+    ----------
+    op : function(S, S) -> S
+    e : S
+        モノイドの単位元
+    mapping : function(F, S) -> S
+    composition : function(f: F, g: F) -> F
+    id : F
+        恒等写像
+    n : int
+    v : list[S]
+        LazySegTreeを参照
+
+    Attributes
+    ----------
+    _e : S
+    _id : F
+        それぞれParametersを参照
+    その他はLazySegTreeを参照
+
+    Methods
+    -------
+    _push_down(self, k, t=0)
+        葉kの祖先のうち、深さがself._log - t未満のものについて
+        根に近い順に遅延要素を子に引き継ぐ
+        Parameters
+        ----------
+        k : int
+            self._size <= k < 2 * self._size
+        t : int
+            0 <= t
+    _update_up(self, k, t=0)
+        葉kの祖先のうち、深さがself._log - t未満のものについて
+        葉に近い順に子の情報から値を更新する
+        Parameters
+        ----------
+        k : int
+            self._size <= k < 2 * self._size
+        t : int
+            0 <= t
+    その他はLazySegTreeを参照
+    """
+    def __init__(self, op, e, mapping, composition, id, n=0, v=[]):
+        assert (len(v) >= 0) and (n >= 0)
+        if len(v) == 0:
+            v = [e] * n
+        self._n = len(v)
+        self._log = (self._n - 1).bit_length()
+        self._size = 1 << self._log
+        self._d = [e] * (2 * self._size)
+        self._lz = [id] * self._size
+        self._dirty = bytearray(self._size)
+        self._pushed = 0
+        self._skipped = 0
+        self._op = op
+        self._e = e
+        self._mapping = mapping
+        self._composition = composition
+        self._id = id
+
+        d = self._d
+        d[self._size:self._size + self._n] = v
+        for i in range(self._size - 1, 0, -1):
+            d[i] = op(d[2 * i], d[2 * i + 1])
+
+    def _push(self, k):
+        dirty = self._dirty
+        if not dirty[k]:
+            self._skipped += 1
+            return
+        self._pushed += 1
+        d = self._d
+        lz = self._lz
+        mapping = self._mapping
+        f = lz[k]
+        c = 2 * k
+        d[c] = mapping(f, d[c])
+        d[c + 1] = mapping(f, d[c + 1])
+        if c < self._size:
+            composition = self._composition
+            lz[c] = composition(f, lz[c])
+            lz[c + 1] = composition(f, lz[c + 1])
+            dirty[c] = dirty[c + 1] = 1
+        lz[k] = self._id
+        dirty[k] = 0
+
+    def _push_down(self, k, t=0):
+        d = self._d
+        lz = self._lz
+        dirty = self._dirty
+        mapping = self._mapping
+        composition = self._composition
+        ident = self._id
+        size = self._size
+        pushed = 0
+        for i in range(self._log, t, -1):
+            j = k >> i
+            if not dirty[j]:
+                continue
+            pushed += 1
+            f = lz[j]
+            c = 2 * j
+            d[c] = mapping(f, d[c])
+            d[c + 1] = mapping(f, d[c + 1])
+            if c < size:
+                lz[c] = composition(f, lz[c])
+                lz[c + 1] = composition(f, lz[c + 1])
+                dirty[c] = dirty[c + 1] = 1
+            lz[j] = ident
+            dirty[j] = 0
+        self._pushed += pushed
+        self._skipped += max(self._log - t, 0) - pushed
+
+    def _update_up(self, k, t=0):
+        d = self._d
+        op = self._op
+        for i in range(t + 1, self._log + 1):
+            j = k >> i
+            d[j] = op(d[2 * j], d[2 * j + 1])
+
+    def set(self, p, x):
+        assert (0 <= p) and (p < self._n)
+        p += self._size
+        self._push_down(p)
+        self._d[p] = x
+        self._update_up(p)
+
+    def get(self, p):
+        assert (0 <= p) and (p < self._n)
+        p += self._size
+        self._push_down(p)
+        return self._d[p]
+
+    def prod(self, left, right):
+        assert (0 <= left) and (left <= right) and (right <= self._n)
+        if left == right:
+            return self._e
+        left += self._size
+        right += self._size
+        self._push_down(left, (left & -left).bit_length() - 1)
+        self._push_down(right, (right & -right).bit_length() - 1)
+
+        d = self._d
+        op = self._op
+        sml = smr = self._e
+        while left < right:
+            if left & 1:
+                sml = op(sml, d[left])
+                left += 1
+            if right & 1:
+                right -= 1
+                smr = op(d[right], smr)
+            left >>= 1
+            right >>= 1
+        return op(sml, smr)
+
+    def prod_many(self, lefts, rights):
+        assert len(lefts) == len(rights)
+        prod = self.prod
+        return [prod(left, right) for left, right in zip(lefts, rights)]
+
+    def apply(self, p, f):
+        assert (0 <= p) and (p < self._n)
+        p += self._size
+        self._push_down(p)
+        self._d[p] = self._mapping(f, self._d[p])
+        self._update_up(p)
+
+    def apply_lr(self, left, right, f):
+        assert (0 <= left) and (left <= right) and (right <= self._n)
+        if left == right:
+            return
+        left += self._size
+        right += self._size
+        tl = (left & -left).bit_length() - 1
+        tr = (right & -right).bit_length() - 1
+        self._push_down(left, tl)
+        self._push_down(right - 1, tr)
+
+        d = self._d
+        lz = self._lz
+        dirty = self._dirty
+        mapping = self._mapping
+        composition = self._composition
+        size = self._size
+        lo, hi = left, right
+        while lo < hi:
+            if lo & 1:
+                d[lo] = mapping(f, d[lo])
+                if lo < size:
+                    lz[lo] = composition(f, lz[lo])
+                    dirty[lo] = 1
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                d[hi] = mapping(f, d[hi])
+                if hi < size:
+                    lz[hi] = composition(f, lz[hi])
+                    dirty[hi] = 1
+            lo >>= 1
+            hi >>= 1
+
+        self._update_up(left, tl)
+        self._update_up(right - 1, tr)
+
+    def max_right(self, left, g):
+        assert (0 <= left) and (left <= self._n)
+        assert g(self._e)
+        if left == self._n:
+            return self._n
+        left += self._size
+        self._push_down(left)
+        d = self._d
+        op = self._op
+        size = self._size
+        sm = self._e
+        while True:
+            while left % 2 == 0:
+                left >>= 1
+            if not g(op(sm, d[left])):
+                while left < size:
+                    self._push(left)
+                    left *= 2
+                    if g(op(sm, d[left])):
+                        sm = op(sm, d[left])
+                        left += 1
+                return left - size
+            sm = op(sm, d[left])
+            left += 1
+            if (left & -left) == left:
+                break
+        return self._n
+
+    def min_left(self, right, g):
+        assert (0 <= right) and (right <= self._n)
+        assert g(self._e)
+        if right == 0:
+            return 0
+        right += self._size
+        self._push_down(right - 1)
+        d = self._d
+        op = self._op
+        size = self._size
+        sm = self._e
+        while True:
+            right -= 1
+            while right > 1 and right % 2:
+                right >>= 1
+            if not g(op(d[right], sm)):
+                while right < size:
+                    self._push(right)
+                    right = 2 * right + 1
+                    if g(op(d[right], sm)):
+                        sm = op(d[right], sm)
+                        right -= 1
+                return right + 1 - size
+            sm = op(d[right], sm)
+            if (right & -right) == right:
+                break
+        return 0
+
+
+class _NumericLazySegTree:
+    """
+    要素と遅延要素が64bit符号付き整数で表される遅延評価セグメントツリーの共通部分。
+    ノードをarray('q')に格納し、mapping, compositionに当たる処理は
+    サブクラスの_all_apply, _pushの中で直接計算する。
+    インターフェースはLazySegTreeと同じ（op, e, mapping, composition, idは
+    指定しない）。
+    各ノードの値は -2**63 以上 2**63 未満でなければならない。
+    (区間和を求めるものでは区間和も含む。範囲外の場合はOverflowErrorとなる)
+
+    Parameters
+    ----------
+    n : int
+        セグメントツリーで管理する要素数。n>=0を満たす。
+        vが与えられない場合に参照する。要素は全て単位元で初期化される。
+    v : list[int]
+        セグメントツリーで管理する要素の初期値
+        vが与えられた場合nは無視する
+
+    Attributes
+    ----------
+    _E : int
+        モノイドの単位元（クラス属性）
+    _ID : int
+        _lzの初期値（恒等写像を表す値、クラス属性）
+    _OP : function(int, int) -> int
+        モノイドの演算（クラス属性）
+    _n : int
+    _log : int
+    _size : int
+        LazySegTreeを参照
+    _d : array('q')
+        セグメントツリーの各ノードの値
+    _lz : array('q')
+        各内部ノードの遅延要素
+
+    Methods
+    -------
+    _all_apply(self, k, f)
+        _d[k]に写像fを反映させ、要素kが葉でないとき_lz[k]に合成する
+    _push(self, k)
+        _lz[k]を子に引き継ぎ、_lz[k]を初期化する
+    _push_down(self, k, t=0)
+    _update_up(self, k, t=0)
+        ValueLazySegTreeを参照
+        サブクラスでは_push_downを_pushを展開したループで上書きする
+    その他はLazySegTreeを参照
+    """
+    _E = 0
+    _ID = 0
+    _OP = None
+
+    def __init__(self, n=0, v=[]):
+        assert (len(v) >= 0) and (n >= 0)
+        if len(v) == 0:
+            v = [self._E] * n
+        self._n = len(v)
+        self._log = (self._n - 1).bit_length()
+        self._size = 1 << self._log
+        self._d = array('q', [self._E]) * (2 * self._size)
+        self._lz = array('q', [self._ID]) * self._size
+        self._d[self._size:self._size + self._n] = array('q', v)
+        self._update_all()
+
+    def _update_all(self):
+        d = self._d
+        op = self._OP
+        for i in range(self._size - 1, 0, -1):
+            d[i] = op(d[2 * i], d[2 * i + 1])
+
+    def _push_down(self, k, t=0):
+        push = self._push
+        for i in range(self._log, t, -1):
+            push(k >> i)
+
+    def _update_up(self, k, t=0):
+        d = self._d
+        op = self._OP
+        for i in range(t + 1, self._log + 1):
+            j = k >> i
+            d[j] = op(d[2 * j], d[2 * j + 1])
+
+    def set(self, p, x):
+        assert (0 <= p) and (p < self._n)
+        p += self._size
+        self._push_down(p)
+        self._d[p] = x
+        self._update_up(p)
+
+    def get(self, p):
+        assert (0 <= p) and (p < self._n)
+        p += self._size
+        self._push_down(p)
+        return self._d[p]
+
+    def prod(self, left, right):
+        assert (0 <= left) and (left <= right) and (right <= self._n)
+        if left == right:
+            return self._E
+        left += self._size
+        right += self._size
+        self._push_down(left, (left & -left).bit_length() - 1)
+        self._push_down(right, (right & -right).bit_length() - 1)
+
+        d = self._d
+        op = self._OP
+        sml = smr = self._E
+        while left < right:
+            if left & 1:
+                sml = op(sml, d[left])
+                left += 1
+            if right & 1:
+                right -= 1
+                smr = op(d[right], smr)
+            left >>= 1
+            right >>= 1
+        return op(sml, smr)
+
+    def prod_many(self, lefts, rights):
+        assert len(lefts) == len(rights)
+        prod = self.prod
+        return [prod(left, right) for left, right in zip(lefts, rights)]
+
+    def all_prod(self):
+        return self._d[1]
+
+    def apply(self, p, f):
+        assert (0 <= p) and (p < self._n)
+        self.apply_lr(p, p + 1, f)
+
+    def apply_lr(self, left, right, f):
+        assert (0 <= left) and (left <= right) and (right <= self._n)
+        if left == right:
+            return
+        left += self._size
+        right += self._size
+        tl = (left & -left).bit_length() - 1
+        tr = (right & -right).bit_length() - 1
+        self._push_down(left, tl)
+        self._push_down(right - 1, tr)
+
+        all_apply = self._all_apply
+        lo, hi = left, right
+        while lo < hi:
+            if lo & 1:
+                all_apply(lo, f)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                all_apply(hi, f)
+            lo >>= 1
+            hi >>= 1
+
+        self._update_up(left, tl)
+        self._update_up(right - 1, tr)
+
+    def max_right(self, left, g):
+        assert (0 <= left) and (left <= self._n)
+        assert g(self._E)
+        if left == self._n:
+            return self._n
+        left += self._size
+        self._push_down(left)
+        d = self._d
+        op = self._OP
+        size = self._size
+        sm = self._E
+        while True:
+            while left % 2 == 0:
+                left >>= 1
+            if not g(op(sm, d[left])):
+                while left < size:
+                    self._push(left)
+                    left *= 2
+                    if g(op(sm, d[left])):
+                        sm = op(sm, d[left])
+                        left += 1
+                return left - size
+            sm = op(sm, d[left])
+            left += 1
+            if (left & -left) == left:
+                break
+        return self._n
+
+    def min_left(self, right, g):
+        assert (0 <= right) and (right <= self._n)
+        assert g(self._E)
+        if right == 0:
+            return 0
+        right += self._size
+        self._push_down(right - 1)
+        d = self._d
+        op = self._OP
+        size = self._size
+        sm = self._E
+        while True:
+            right -= 1
+            while right > 1 and right % 2:
+                right >>= 1
+            if not g(op(d[right], sm)):
+                while right < size:
+                    self._push(right)
+                    right = 2 * right + 1
+                    if g(op(d[right], sm)):
+                        sm = op(d[right], sm)
+                        right -= 1
+                return right + 1 - size
+            sm = op(d[right], sm)
+            if (right & -right) == right:
+                break
+        return 0
+
+
+class AddSumLazySegTree(_NumericLazySegTree):
+    """
+    区間加算・区間和の遅延評価セグメントツリー
+    写像fは整数で、各要素にfを加える。
+    詳細は_NumericLazySegTreeを参照
+    """
+    _E = 0
+    _ID = 0
+    _OP = staticmethod(operator.add)
+
+    def _all_apply(self, k, f):
+        self._d[k] += f * (self._size >> (k.bit_length() - 1))
+        if k < self._size:
+            self._lz[k] += f
+
+    def _push(self, k):
+        f = self._lz[k]
+        if f:
+            d = self._d
+            c = 2 * k
+            w = f * (self._size >> (c.bit_length() - 1))
+            d[c] += w
+            d[c + 1] += w
+            if c < self._size:
+                lz = self._lz
+                lz[c] += f
+                lz[c + 1] += f
+            self._lz[k] = 0
+
+    def _push_down(self, k, t=0):
+        d = self._d
+        lz = self._lz
+        size = self._size
+        for i in range(self._log, t, -1):
+            j = k >> i
+            f = lz[j]
+            if f:
+                c = 2 * j
+                w = f * (size >> (c.bit_length() - 1))
+                d[c] += w
+                d[c + 1] += w
+                if c < size:
+                    lz[c] += f
+                    lz[c + 1] += f
+                lz[j] = 0
+
+
+class AddMinLazySegTree(_NumericLazySegTree):
+    """
+    区間加算・区間最小値の遅延評価セグメントツリー（単位元は2**63-1）
+    写像fは整数で、各要素にfを加える。
+    単位元に対応するノード（要素数の範囲外の葉など）にはfを加えない。
+    詳細は_NumericLazySegTreeを参照
+    """
+    _E = (1 << 63) - 1
+    _ID = 0
+    _OP = staticmethod(min)
+
+    def _all_apply(self, k, f):
+        d = self._d
+        if d[k] != self._E:
+            d[k] += f
+        if k < self._size:
+            self._lz[k] += f
+
+    def _push(self, k):
+        lz = self._lz
+        f = lz[k]
+        if f:
+            d = self._d
+            e = self._E
+            c = 2 * k
+            if d[c] != e:
+                d[c] += f
+            if d[c + 1] != e:
+                d[c + 1] += f
+            if c < self._size:
+                lz[c] += f
+                lz[c + 1] += f
+            lz[k] = 0
+
+    def _push_down(self, k, t=0):
+        d = self._d
+        lz = self._lz
+        e = self._E
+        size = self._size
+        for i in range(self._log, t, -1):
+            j = k >> i
+            f = lz[j]
+            if f:
+                c = 2 * j
+                if d[c] != e:
+                    d[c] += f
+                if d[c + 1] != e:
+                    d[c + 1] += f
+                if c < size:
+                    lz[c] += f
+                    lz[c + 1] += f
+                lz[j] = 0
+
+
+class AddMaxLazySegTree(_NumericLazySegTree):
+    """
+    区間加算・区間最大値の遅延評価セグメントツリー（単位元は-2**63）
+    写像fは整数で、各要素にfを加える。
+    単位元に対応するノード（要素数の範囲外の葉など）にはfを加えない。
+    詳細は_NumericLazySegTreeを参照
+    """
+    _E = -(1 << 63)
+    _ID = 0
+    _OP = staticmethod(max)
+
+    _all_apply = AddMinLazySegTree._all_apply
+    _push = AddMinLazySegTree._push
+    _push_down = AddMinLazySegTree._push_down
+
+
+class AssignSumLazySegTree(_NumericLazySegTree):
+    """
+    区間代入・区間和の遅延評価セグメントツリー
+    写像fは整数で、各要素をfで置き換える。f != -2**63 を満たす。
+    詳細は_NumericLazySegTreeを参照
+    """
+    _E = 0
+    _ID = -(1 << 63)
+    _OP = staticmethod(operator.add)
+
+    def _all_apply(self, k, f):
+        self._d[k] = f * (self._size >> (k.bit_length() - 1))
+        if k < self._size:
+            self._lz[k] = f
+
+    def _push(self, k):
+        lz = self._lz
+        f = lz[k]
+        if f != self._ID:
+            d = self._d
+            c = 2 * k
+            w = f * (self._size >> (c.bit_length() - 1))
+            d[c] = w
+            d[c + 1] = w
+            if c < self._size:
+                lz[c] = f
+                lz[c + 1] = f
+            lz[k] = self._ID
+
+    def _push_down(self, k, t=0):
+        d = self._d
+        lz = self._lz
+        ident = self._ID
+        size = self._size
+        for i in range(self._log, t, -1):
+            j = k >> i
+            f = lz[j]
+            if f != ident:
+                c = 2 * j
+                w = f * (size >> (c.bit_length() - 1))
+                d[c] = w
+                d[c + 1] = w
+                if c < size:
+                    lz[c] = f
+                    lz[c + 1] = f
+                lz[j] = ident
+
+
+class AssignMinLazySegTree(_NumericLazySegTree):
+    """
+    区間代入・区間最小値の遅延評価セグメントツリー（単位元は2**63-1）
+    写像fは整数で、各要素をfで置き換える。f != -2**63 を満たす。
+    詳細は_NumericLazySegTreeを参照
+    """
+    _E = (1 << 63) - 1
+    _ID = -(1 << 63)
+    _OP = staticmethod(min)
+
+    def _all_apply(self, k, f):
+        self._d[k] = f
+        if k < self._size:
+            self._lz[k] = f
+
+    def _push(self, k):
+        lz = self._lz
+        f = lz[k]
+        if f != self._ID:
+            d = self._d
+            c = 2 * k
+            d[c] = f
+            d[c + 1] = f
+            if c < self._size:
+                lz[c] = f
+                lz[c + 1] = f
+            lz[k] = self._ID
+
+    def _push_down(self, k, t=0):
+        d = self._d
+        lz = self._lz
+        ident = self._ID
+        size = self._size
+        for i in range(self._log, t, -1):
+            j = k >> i
+            f = lz[j]
+            if f != ident:
+                c = 2 * j
+                d[c] = f
+                d[c + 1] = f
+                if c < size:
+                    lz[c] = f
+                    lz[c + 1] = f
+                lz[j] = ident
+
+
+class AssignMaxLazySegTree(_NumericLazySegTree):
+    """
+    区間代入・区間最大値の遅延評価セグメントツリー（単位元は-2**63）
+    写像fは整数で、各要素をfで置き換える。f != -2**63 を満たす。
+    詳細は_NumericLazySegTreeを参照
+    """
+    _E = -(1 << 63)
+    _ID = -(1 << 63)
+    _OP = staticmethod(max)
+
+    _all_apply = AssignMinLazySegTree._all_apply
+    _push = AssignMinLazySegTree._push
+    _push_down = AssignMinLazySegTree._push_down
+
+
+class AffineSumLazySegTree(_NumericLazySegTree):
+    """
+    区間アフィン変換・区間和（mod）の遅延評価セグメントツリー
+    写像fは整数の組(a, b)で、各要素xを(a * x + b) % modで置き換える。
+    要素と区間和はmodで割った余りで管理する。
+
+    Parameters
+    ----------
+    mod : int
+        1 <= mod < 2**62
+    n : int
+    v : list[int]
+        0 <= v[i] < mod
+        _NumericLazySegTreeを参照
+
+    Attributes
+    ----------
+    _mod : int
+        法
+    _OP : function(int, int) -> int
+        (x + y) % mod を返す関数（インスタンス属性）
+    _lz : array('q')
+        各内部ノードの遅延要素のうち、aの部分
+    _lzb : array('q')
+        各内部ノードの遅延要素のうち、bの部分
+    その他は_NumericLazySegTreeを参照
+    """
+    _E = 0
+    _ID = 1
+
+    def __init__(self, mod, n=0, v=[]):
+        assert 1 <= mod < 1 << 62
+        self._mod = mod
+        self._OP = lambda x, y: (x + y) % mod
+        super().__init__(n, v)
+        self._lzb = array('q', [0]) * self._size
+
+    def _all_apply(self, k, f):
+        a, b = f
+        mod = self._mod
+        d = self._d
+        d[k] = (a * d[k] + b * (self._size >> (k.bit_length() - 1))) % mod
+        if k < self._size:
+            lz = self._lz
+            lzb = self._lzb
+            lz[k] = a * lz[k] % mod
+            lzb[k] = (a * lzb[k] + b) % mod
+
+    def _push(self, k):
+        lz = self._lz
+        lzb = self._lzb
+        a = lz[k]
+        b = lzb[k]
+        if a != 1 or b:
+            mod = self._mod
+            d = self._d
+            c = 2 * k
+            w = b * (self._size >> (c.bit_length() - 1))
+            d[c] = (a * d[c] + w) % mod
+            d[c + 1] = (a * d[c + 1] + w) % mod
+            if c < self._size:
+                lz[c] = a * lz[c] % mod
+                lzb[c] = (a * lzb[c] + b) % mod
+                lz[c + 1] = a * lz[c + 1] % mod
+                lzb[c + 1] = (a * lzb[c + 1] + b) % mod
+            lz[k] = 1
+            lzb[k] = 0
+
+    def _push_down(self, k, t=0):
+        mod = self._mod
+        d = self._d
+        lz = self._lz
+        lzb = self._lzb
+        size = self._size
+        for i in range(self._log, t, -1):
+            j = k >> i
+            a = lz[j]
+            b = lzb[j]
+            if a != 1 or b:
+                c = 2 * j
+                w = b * (size >> (c.bit_length() - 1))
+                d[c] = (a * d[c] + w) % mod
+                d[c + 1] = (a * d[c + 1] + w) % mod
+                if c < size:
+                    lz[c] = a * lz[c] % mod
+                    lzb[c] = (a * lzb[c] + b) % mod
+                    lz[c + 1] = a * lz[c + 1] % mod
+                    lzb[c + 1] = (a * lzb[c + 1] + b) % mod
+                lz[j] = 1
+                lzb[j] = 0
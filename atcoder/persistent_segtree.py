@@ -0,0 +1,174 @@
+from array import array
+
+
+class PersistentSegTree:
+    """
+    永続セグメントツリー
+    setのたびに根から葉までの経路のノードだけを複製して新しい版を作成し、
+    過去の任意の版に対してprodを計算できる。
+    1回のsetで作成されるノードはO(log n)個。
+    ノードはオブジェクトではなく、値と子の番号を並べた配列で管理する。
+
+    Parameters
+    ----------
+    モノイドの型をSとする。
+
+    op : function(S, S) -> S
+        S × S を計算する関数。
+    e : function() -> S
+        モノイドの初期値を返す関数。単位元。
+    n : int
+        セグメントツリーで管理する要素数。n>=0を満たす。
+        vが与えられない場合に参照する。要素は全てe()で初期化される。
+    v : list[S]
+        セグメントツリーで管理する要素の初期値
+        vが与えられた場合nは無視する
+
+    Attributes
+    ----------
+    _n : int
+        セグメントツリーで管理する要素数
+    _log : int
+        _n <= 2**x を満たす最小のx
+    _size : int
+        1 << self._log
+    _d : list[S]
+        各ノードの値
+        初期の版のノードはSegTreeと同じ並び（_d[1]が根、_d[x]の子は_d[x*2]と
+        _d[x*2+1]）で、setで作成したノードはその後ろに追加する。
+    _left : array('q')
+    _right : array('q')
+        各ノードの左の子、右の子の番号。葉の場合は0
+    _roots : array('q')
+        各版の根の番号。版0は初期状態
+    _op : function(S, S)
+    _e : function()
+        それぞれParametersを参照
+
+    Methods
+    -------
+    __init__(self, op, e, n=None, v=None)
+        初期化
+    versions(self)
+        作成済みの版の数を返却する
+    set(self, version, p, x)
+        版versionのp番目の要素をxで置き換えた新しい版を作成する
+        版versionは変更されない。
+        Parameters
+        ----------
+        version : int
+            0 <= version < self.versions()
+        p : int
+            0 <= p < self._n
+        x : S
+        Returns
+        -------
+        int
+            新しい版の番号
+    get(self, version, p)
+        版versionのp番目の要素の取得
+    prod(self, version, left, right)
+        版versionのleft番目～right-1番目の要素の演算結果
+        Parameters
+        ----------
+        version : int
+            0 <= version < self.versions()
+        left : int
+        right : int
+            0 <= left <= right <= self._n
+        Returns
+        -------
+        S
+            left==rightの場合はe()を返却する。
+    all_prod(self, version)
+        版versionの0番目～n-1番目の要素の演算結果
+    """
+    def __init__(self, op, e, n=None, v=None):
+        if n is None and v is None:
+            v = []
+        elif v is None:
+            assert n >= 0
+            v = [e()] * n
+        self._n = len(v)
+        self._log = (self._n - 1).bit_length()
+        self._size = 1 << self._log
+        self._op = op
+        self._e = e
+        size = self._size
+        d = [e()] * (2 * size)
+        d[size:size + self._n] = v
+        for i in range(size - 1, 0, -1):
+            d[i] = op(d[2 * i], d[2 * i + 1])
+        self._d = d
+        self._left = array('q', range(0, 2 * size, 2)) + array('q', [0]) * size
+        self._right = array('q', range(1, 2 * size, 2)) \
+            + array('q', [0]) * size
+        self._right[0] = 0
+        self._roots = array('q', [1])
+
+    def versions(self):
+        return len(self._roots)
+
+    def set(self, version, p, x):
+        assert 0 <= version < len(self._roots)
+        assert 0 <= p < self._n
+        d = self._d
+        left = self._left
+        right = self._right
+        op = self._op
+        path = []
+        k = self._roots[version]
+        for i in range(self._log - 1, -1, -1):
+            path.append(k)
+            k = right[k] if p >> i & 1 else left[k]
+
+        d.append(x)
+        left.append(0)
+        right.append(0)
+        for i, k in enumerate(reversed(path)):
+            if p >> i & 1:
+                lc = left[k]
+                rc = len(d) - 1
+            else:
+                lc = len(d) - 1
+                rc = right[k]
+            d.append(op(d[lc], d[rc]))
+            left.append(lc)
+            right.append(rc)
+        self._roots.append(len(d) - 1)
+        return len(self._roots) - 1
+
+    def get(self, version, p):
+        assert 0 <= version < len(self._roots)
+        assert 0 <= p < self._n
+        left = self._left
+        right = self._right
+        k = self._roots[version]
+        for i in range(self._log - 1, -1, -1):
+            k = right[k] if p >> i & 1 else left[k]
+        return self._d[k]
+
+    def prod(self, version, left, right):
+        assert 0 <= version < len(self._roots)
+        assert 0 <= left <= right <= self._n
+        d = self._d
+        lch = self._left
+        rch = self._right
+        op = self._op
+        sm = self._e()
+        stack = [(self._roots[version], 0, self._size)]
+        while stack:
+            k, a, w = stack.pop()
+            if right <= a or a + w <= left:
+                continue
+            if left <= a and a + w <= right:
+                sm = op(sm, d[k])
+                continue
+            w >>= 1
+            stack.append((rch[k], a + w, w))
+            stack.append((lch[k], a, w))
+        return sm
+
+    def all_prod(self, version):
+        assert 0 <= version < len(self._roots)
+        return self._d[self._roots[version]]
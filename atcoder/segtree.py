@@ -1,3 +1,12 @@
+from array import array
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 class SegTree:
     """
     セグメントツリー
@@ -61,6 +70,16 @@ class SegTree:
             0 <= p < self._n
             置き換える要素の番号。
         x : S
+    set_many(self, indices, values)
+        indices[i]番目の要素をvalues[i]で置き換える
+        葉を全て書き換えた後、変化したノードの祖先だけを深い順に1度ずつ更新する。
+        同じ番号が複数回現れる場合は最後の値が採用される。
+        Parameters
+        ----------
+        indices : list[int]
+            0 <= indices[i] < self._n
+        values : list[S]
+            len(values) == len(indices)
     get(self, p)
         p番目の要素の取得
         Parameters
@@ -84,6 +103,19 @@ class SegTree:
         S
             l番目～r-1番目の要素の演算結果
             l==rの場合はe()を返却する。
+    prod_many(self, lefts, rights)
+        各iについてprod(lefts[i], rights[i])を計算する
+        1回の呼び出しでまとめて処理し、単位元e()の呼び出しも1回にする。
+        Parameters
+        ----------
+        lefts : list[int]
+        rights : list[int]
+            len(lefts) == len(rights)
+            0 <= lefts[i] <= rights[i] <= self._n
+        Returns
+        -------
+        list[S]
+            各区間の演算結果
     all_prod(self)
         0番目～n-1番目の要素の演算結果
         Returns
@@ -152,6 +184,21 @@ class SegTree:
         for i in range(1, self.__log + 1):
             self.__update(p >> i)
 
+    def set_many(self, indices, values):
+        assert len(indices) == len(values)
+        assert all(0 <= p < self.__n for p in indices)
+        d = self.__d
+        op = self.__op
+        dirty = set()
+        for p, x in zip(indices, values):
+            p += self.__size
+            d[p] = x
+            dirty.add(p >> 1)
+        for _ in range(self.__log):
+            for k in dirty:
+                d[k] = op(d[2 * k], d[2 * k + 1])
+            dirty = {k >> 1 for k in dirty}
+
     def get(self, p):
         assert 0 <= p and p < self.__n
         return self.__d[p + self.__size]
@@ -175,6 +222,31 @@ class SegTree:
 
         return self.__op(sml, smr)
 
+    def prod_many(self, lefts, rights):
+        assert len(lefts) == len(rights)
+        n = self.__n
+        size = self.__size
+        d = self.__d
+        op = self.__op
+        e = self.__e()
+        res = []
+        for left, right in zip(lefts, rights):
+            assert 0 <= left <= right <= n
+            sml = smr = e
+            left += size
+            right += size
+            while left < right:
+                if left & 1:
+                    sml = op(sml, d[left])
+                    left += 1
+                if right & 1:
+                    right -= 1
+                    smr = op(d[right], smr)
+                left >>= 1
+                right >>= 1
+            res.append(op(sml, smr))
+        return res
+
     def all_prod(self):
         return self.__d[1]
 
@@ -223,3 +295,335 @@ class SegTree:
             if (right & -right) == right:
                 break
         return 0
+
+
+class _NumericSegTree:
+    """
+    要素が64bit符号付き整数で、演算が和・最小値・最大値のいずれかである
+    セグメントツリーの共通部分。
+    ノードをarray('q')に格納し、演算を関数呼び出しではなく直接計算する。
+    インターフェースはSegTreeと同じ（op, eは指定しない）。
+    各ノードの値は -2**63 以上 2**63 未満でなければならない。
+    (SumSegTreeでは区間和も含む。範囲外の場合はOverflowErrorとなる。
+    set, set_manyでOverflowErrorとなった場合、木は変更されない)
+
+    Parameters
+    ----------
+    n : int
+        セグメントツリーで管理する要素数。n>=0を満たす。
+        vが与えられない場合に参照する。要素は全て単位元で初期化される。
+    v : list[int]
+        セグメントツリーで管理する要素の初期値
+        vが与えられた場合nは無視する
+
+    Attributes
+    ----------
+    _E : int
+        単位元（クラス属性）
+    _OP : function(int, int) -> int
+        演算（クラス属性）。max_right, min_left, 構築で用いる。
+    _NP_OP : str
+        _OPに対応するNumPyのufuncの名前（クラス属性）。
+        NumPyがインストールされている場合、構築をufuncで一段ずつ行う。
+    _n : int
+        セグメントツリーで管理する要素数
+    _log : int
+        _n <= 2**x を満たす最小のx
+    _size : int
+        1 << self._log
+    _d : array('q')
+        セグメントツリーの各ノードの値
+        _d[1]が根に当たり、_d[x]の子は_d[x*2]と_d[x*2+1]になる。
+
+    Methods
+    -------
+    _build(self)
+        葉の値から内部ノードを一段ずつまとめて計算する
+    _np_ok(self)
+        構築とprod_manyにNumPyを用いてよいかどうかを返却する
+    prod_many(self, lefts, rights)
+        NumPyがインストールされていて_np_ok()が真の場合、
+        全クエリの区間の端を配列で持ち、一段ずつ全クエリ分をまとめて計算する。
+        そうでない場合はprodを繰り返し呼ぶ。
+    その他はSegTreeを参照
+    """
+    _E = 0
+    _OP = None
+    _NP_OP = None
+
+    def __init__(self, n=None, v=None):
+        if n is None and v is None:
+            v = []
+        elif v is None:
+            assert n >= 0
+            v = [self._E] * n
+        self._n = len(v)
+        self._log = (self._n - 1).bit_length()
+        self._size = 1 << self._log
+        self._d = array('q', [self._E]) * (2 * self._size)
+        self._d[self._size:self._size + self._n] = array('q', v)
+        self._build()
+
+    def _build(self):
+        d = self._d
+        lo = self._size >> 1
+        if np is not None and self._n and self._np_ok():
+            x = np.frombuffer(d, dtype=np.int64)
+            ufunc = getattr(np, self._NP_OP)
+            while lo:
+                ufunc(x[2 * lo:4 * lo:2], x[2 * lo + 1:4 * lo:2],
+                      out=x[lo:2 * lo])
+                lo >>= 1
+            return
+        op = self._OP
+        while lo:
+            d[lo:2 * lo] = array('q', map(op, d[2 * lo:4 * lo:2],
+                                          d[2 * lo + 1:4 * lo:2]))
+            lo >>= 1
+
+    def _np_ok(self):
+        return True
+
+    def get(self, p):
+        assert 0 <= p < self._n
+        return self._d[p + self._size]
+
+    def all_prod(self):
+        return self._d[1]
+
+    def set(self, p, x):
+        assert 0 <= p < self._n
+        op = self._OP
+        d = self._d
+        p += self._size
+        d[p] = x
+        p >>= 1
+        while p:
+            d[p] = op(d[2 * p], d[2 * p + 1])
+            p >>= 1
+
+    def set_many(self, indices, values):
+        assert len(indices) == len(values)
+        assert all(0 <= p < self._n for p in indices)
+        op = self._OP
+        d = self._d
+        new = {}
+        for p, x in zip(indices, values):
+            new[p + self._size] = x
+        dirty = {p >> 1 for p in new}
+        for _ in range(self._log):
+            for k in dirty:
+                new[k] = op(new.get(2 * k, d[2 * k]),
+                            new.get(2 * k + 1, d[2 * k + 1]))
+            dirty = {k >> 1 for k in dirty}
+        # 範囲外の値があればここでOverflowErrorとなり、木は変更されない
+        nodes = list(new)
+        packed = array('q', [new[k] for k in nodes])
+        for k, y in zip(nodes, packed):
+            d[k] = y
+
+    def prod_many(self, lefts, rights):
+        assert len(lefts) == len(rights)
+        if np is None or not self._np_ok():
+            prod = self.prod
+            return [prod(left, right) for left, right in zip(lefts, rights)]
+        left = np.array(lefts, dtype=np.int64).reshape(-1)
+        right = np.array(rights, dtype=np.int64).reshape(-1)
+        assert ((0 <= left) & (left <= right) & (right <= self._n)).all()
+        x = np.frombuffer(self._d, dtype=np.int64)
+        ufunc = getattr(np, self._NP_OP)
+        sm = np.full(len(left), self._E, dtype=np.int64)
+        left += self._size
+        right += self._size
+        for _ in range(self._log + 1):
+            m = (left & 1).astype(bool) & (left < right)
+            ufunc(sm, x.take(left, mode='clip'), out=sm, where=m)
+            left += m
+            m = (right & 1).astype(bool) & (left < right)
+            right -= m
+            ufunc(sm, x.take(right, mode='clip'), out=sm, where=m)
+            left >>= 1
+            right >>= 1
+        return sm.tolist()
+
+    def max_right(self, left, f):
+        assert 0 <= left <= self._n
+        op = self._OP
+        d = self._d
+        assert f(self._E)
+        if left == self._n:
+            return self._n
+        left += self._size
+        sm = self._E
+        while True:
+            while left % 2 == 0:
+                left //= 2
+            if not f(op(sm, d[left])):
+                while left < self._size:
+                    left *= 2
+                    if f(op(sm, d[left])):
+                        sm = op(sm, d[left])
+                        left += 1
+                return left - self._size
+            sm = op(sm, d[left])
+            left += 1
+            if (left & -left) == left:
+                break
+        return self._n
+
+    def min_left(self, right, f):
+        assert 0 <= right <= self._n
+        op = self._OP
+        d = self._d
+        assert f(self._E)
+        if right == 0:
+            return 0
+        right += self._size
+        sm = self._E
+        while True:
+            right -= 1
+            while right > 1 and right % 2:
+                right //= 2
+            if not f(op(d[right], sm)):
+                while right < self._size:
+                    right = 2 * right + 1
+                    if f(op(d[right], sm)):
+                        sm = op(d[right], sm)
+                        right -= 1
+                return right + 1 - self._size
+            sm = op(d[right], sm)
+            if (right & -right) == right:
+                break
+        return 0
+
+
+class SumSegTree(_NumericSegTree):
+    """
+    区間和を求めるセグメントツリー（単位元は0）
+    詳細は_NumericSegTreeを参照
+    """
+    _E = 0
+    _OP = staticmethod(operator.add)
+    _NP_OP = 'add'
+
+    def _np_ok(self):
+        # NumPyの加算はオーバーフローを検出しないので、
+        # どの区間和も64bitに収まることが葉から分かる場合に限る。
+        if not self._n:
+            return True
+        leaves = np.frombuffer(self._d, dtype=np.int64)[
+            self._size:self._size + self._n]
+        return max(-int(leaves.min()), int(leaves.max())) * self._n < 1 << 63
+
+    def set(self, p, x):
+        assert 0 <= p < self._n
+        d = self._d
+        p += self._size
+        diff = x - d[p]
+        path = []
+        while p:
+            path.append(p)
+            p >>= 1
+        # 範囲外の値があればここでOverflowErrorとなり、木は変更されない
+        new = array('q', [d[k] + diff for k in path])
+        for k, y in zip(path, new):
+            d[k] = y
+
+    def prod(self, left, right):
+        assert 0 <= left <= right <= self._n
+        d = self._d
+        sm = 0
+        left += self._size
+        right += self._size
+        while left < right:
+            if left & 1:
+                sm += d[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                sm += d[right]
+            left >>= 1
+            right >>= 1
+        return sm
+
+
+class MinSegTree(_NumericSegTree):
+    """
+    区間の最小値を求めるセグメントツリー（単位元は2**63-1）
+    詳細は_NumericSegTreeを参照
+    """
+    _E = (1 << 63) - 1
+    _OP = staticmethod(min)
+    _NP_OP = 'minimum'
+
+    def set(self, p, x):
+        assert 0 <= p < self._n
+        d = self._d
+        p += self._size
+        d[p] = x
+        p >>= 1
+        while p:
+            lv = d[2 * p]
+            rv = d[2 * p + 1]
+            d[p] = lv if lv < rv else rv
+            p >>= 1
+
+    def prod(self, left, right):
+        assert 0 <= left <= right <= self._n
+        d = self._d
+        sm = self._E
+        left += self._size
+        right += self._size
+        while left < right:
+            if left & 1:
+                if d[left] < sm:
+                    sm = d[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                if d[right] < sm:
+                    sm = d[right]
+            left >>= 1
+            right >>= 1
+        return sm
+
+
+class MaxSegTree(_NumericSegTree):
+    """
+    区間の最大値を求めるセグメントツリー（単位元は-2**63）
+    詳細は_NumericSegTreeを参照
+    """
+    _E = -(1 << 63)
+    _OP = staticmethod(max)
+    _NP_OP = 'maximum'
+
+    def set(self, p, x):
+        assert 0 <= p < self._n
+        d = self._d
+        p += self._size
+        d[p] = x
+        p >>= 1
+        while p:
+            lv = d[2 * p]
+            rv = d[2 * p + 1]
+            d[p] = lv if lv > rv else rv
+            p >>= 1
+
+    def prod(self, left, right):
+        assert 0 <= left <= right <= self._n
+        d = self._d
+        sm = self._E
+        left += self._size
+        right += self._size
+        while left < right:
+            if left & 1:
+                if d[left] > sm:
+                    sm = d[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                if d[right] > sm:
+                    sm = d[right]
+            left >>= 1
+            right >>= 1
+        return sm
@@ -0,0 +1,303 @@
+import operator
+
+
+class SegTreeBeats:
+    """
+    Segment Tree Beats
+    区間chmin, 区間chmax, 区間加算と、区間和・区間最大値・区間最小値の計算を
+    ならしO(log^2 n)で行う。
+    各ノードに最大値・2番目の最大値・最大値の個数（最小値も同様）を持ち、
+    chminの値が2番目の最大値より大きいノードでは最大値だけを書き換えて止め、
+    そうでない場合だけ子に降りる。
+
+    Parameters
+    ----------
+    n : int
+        セグメントツリーで管理する要素数。n>=0を満たす。
+        vが与えられない場合に参照する。要素は全て0で初期化される。
+    v : list[int]
+        セグメントツリーで管理する要素の初期値
+        vが与えられた場合nは無視する
+
+    Attributes
+    ----------
+    _n : int
+        セグメントツリーで管理する要素数
+    _log : int
+        _n <= 2**x を満たす最小のx
+    _size : int
+        1 << self._log
+    _sum : list[int]
+        各ノードの区間和
+    _max1 : list[int]
+    _max2 : list[int]
+    _maxc : list[int]
+        各ノードの最大値、2番目の最大値（なければ-inf）、最大値の個数
+    _min1 : list[int]
+    _min2 : list[int]
+    _minc : list[int]
+        各ノードの最小値、2番目の最小値（なければinf）、最小値の個数
+    _lz : list[int]
+        各内部ノードの遅延している加算の値
+    _len : list[int]
+        各ノードが表す区間に含まれる要素数（0 <= i < nの要素のみ数える）
+
+    Methods
+    -------
+    __init__(self, n=0, v=[])
+        初期化
+    _update(self, k)
+        子の情報から親(=k)を更新する
+    _add_node(self, k, x)
+        ノードkの全要素にxを加える
+    _chmin_node(self, k, x)
+        ノードkの全要素をmin(a_i, x)で置き換える
+        _max2[k] < x < _max1[k] を満たす場合に限る
+    _chmax_node(self, k, x)
+        ノードkの全要素をmax(a_i, x)で置き換える
+        _min1[k] < x < _min2[k] を満たす場合に限る
+    _push(self, k)
+        ノードkの遅延している操作を子に引き継ぐ
+    _push_down(self, left, right)
+        区間[left, right)の計算に必要な祖先の_pushを行う
+        （left, rightは葉の番号）
+    set(self, p, x)
+        p番目の要素をxで置き換える
+    get(self, p)
+        p番目の要素の取得
+    _apply(self, left, right, x, kind, k, a, b)
+        ノードk（区間[a, b)を表す）以下で、chmin(kind=0), chmax(kind=1),
+        add(kind=2)を再帰的に行う
+    _fold(self, left, right, d, op, e)
+        sum, max, minの本体
+    chmin(self, left, right, x)
+        left番目～right-1番目の要素a_iをmin(a_i, x)で置き換える
+    chmax(self, left, right, x)
+        left番目～right-1番目の要素a_iをmax(a_i, x)で置き換える
+    add(self, left, right, x)
+        left番目～right-1番目の要素にxを加える
+
+        Parameters
+        ----------
+        left : int
+        right : int
+            0 <= left <= right <= self._n
+        x : int
+    sum(self, left, right)
+        left番目～right-1番目の要素の和
+        left==rightの場合は0を返却する。
+    max(self, left, right)
+        left番目～right-1番目の要素の最大値
+        left==rightの場合は-infを返却する。
+    min(self, left, right)
+        left番目～right-1番目の要素の最小値
+        left==rightの場合はinfを返却する。
+
+        Parameters
+        ----------
+        left : int
+        right : int
+            0 <= left <= right <= self._n
+    """
+    _INF = float('inf')
+
+    def __init__(self, n=0, v=[]):
+        assert (len(v) >= 0) and (n >= 0)
+        if len(v) == 0:
+            v = [0] * n
+        inf = self._INF
+        self._n = len(v)
+        self._log = (self._n - 1).bit_length()
+        self._size = 1 << self._log
+        size = self._size
+        self._sum = [0] * (2 * size)
+        self._max1 = [-inf] * (2 * size)
+        self._max2 = [-inf] * (2 * size)
+        self._maxc = [0] * (2 * size)
+        self._min1 = [inf] * (2 * size)
+        self._min2 = [inf] * (2 * size)
+        self._minc = [0] * (2 * size)
+        self._lz = [0] * size
+        self._len = [0] * (2 * size)
+        for i, x in enumerate(v):
+            k = size + i
+            self._sum[k] = self._max1[k] = self._min1[k] = x
+            self._maxc[k] = self._minc[k] = self._len[k] = 1
+        for k in range(size - 1, 0, -1):
+            self._len[k] = self._len[2 * k] + self._len[2 * k + 1]
+            self._update(k)
+
+    def _update(self, k):
+        max1 = self._max1
+        max2 = self._max2
+        maxc = self._maxc
+        min1 = self._min1
+        min2 = self._min2
+        minc = self._minc
+        lc = 2 * k
+        rc = lc + 1
+        self._sum[k] = self._sum[lc] + self._sum[rc]
+
+        if max1[lc] > max1[rc]:
+            max1[k] = max1[lc]
+            maxc[k] = maxc[lc]
+            max2[k] = max(max2[lc], max1[rc])
+        elif max1[lc] < max1[rc]:
+            max1[k] = max1[rc]
+            maxc[k] = maxc[rc]
+            max2[k] = max(max1[lc], max2[rc])
+        else:
+            max1[k] = max1[lc]
+            maxc[k] = maxc[lc] + maxc[rc]
+            max2[k] = max(max2[lc], max2[rc])
+
+        if min1[lc] < min1[rc]:
+            min1[k] = min1[lc]
+            minc[k] = minc[lc]
+            min2[k] = min(min2[lc], min1[rc])
+        elif min1[lc] > min1[rc]:
+            min1[k] = min1[rc]
+            minc[k] = minc[rc]
+            min2[k] = min(min1[lc], min2[rc])
+        else:
+            min1[k] = min1[lc]
+            minc[k] = minc[lc] + minc[rc]
+            min2[k] = min(min2[lc], min2[rc])
+
+    def _add_node(self, k, x):
+        self._sum[k] += x * self._len[k]
+        self._max1[k] += x
+        self._max2[k] += x
+        self._min1[k] += x
+        self._min2[k] += x
+        if k < self._size:
+            self._lz[k] += x
+
+    def _chmin_node(self, k, x):
+        max1 = self._max1
+        self._sum[k] += (x - max1[k]) * self._maxc[k]
+        if self._min1[k] == max1[k]:
+            self._min1[k] = x
+        elif self._min2[k] == max1[k]:
+            self._min2[k] = x
+        max1[k] = x
+
+    def _chmax_node(self, k, x):
+        min1 = self._min1
+        self._sum[k] += (x - min1[k]) * self._minc[k]
+        if self._max1[k] == min1[k]:
+            self._max1[k] = x
+        elif self._max2[k] == min1[k]:
+            self._max2[k] = x
+        min1[k] = x
+
+    def _push(self, k):
+        lc = 2 * k
+        rc = lc + 1
+        if self._lz[k]:
+            x = self._lz[k]
+            if self._len[lc]:
+                self._add_node(lc, x)
+            if self._len[rc]:
+                self._add_node(rc, x)
+            self._lz[k] = 0
+        m = self._max1[k]
+        for c in (lc, rc):
+            if self._max1[c] > m:
+                self._chmin_node(c, m)
+        m = self._min1[k]
+        for c in (lc, rc):
+            if self._min1[c] < m:
+                self._chmax_node(c, m)
+
+    def _push_down(self, left, right):
+        for i in range(self._log, 0, -1):
+            if ((left >> i) << i) != left:
+                self._push(left >> i)
+            if ((right >> i) << i) != right:
+                self._push((right - 1) >> i)
+
+    def set(self, p, x):
+        assert 0 <= p < self._n
+        k = p + self._size
+        for i in range(self._log, 0, -1):
+            self._push(k >> i)
+        self._sum[k] = self._max1[k] = self._min1[k] = x
+        for i in range(1, self._log + 1):
+            self._update(k >> i)
+
+    def get(self, p):
+        assert 0 <= p < self._n
+        k = p + self._size
+        for i in range(self._log, 0, -1):
+            self._push(k >> i)
+        return self._sum[k]
+
+    def _apply(self, left, right, x, kind, k, a, b):
+        if b <= left or right <= a:
+            return
+        if kind == 0:
+            if self._max1[k] <= x:
+                return
+            if left <= a and b <= right and self._max2[k] < x:
+                self._chmin_node(k, x)
+                return
+        elif kind == 1:
+            if self._min1[k] >= x:
+                return
+            if left <= a and b <= right and self._min2[k] > x:
+                self._chmax_node(k, x)
+                return
+        elif left <= a and b <= right:
+            self._add_node(k, x)
+            return
+        self._push(k)
+        mid = (a + b) // 2
+        self._apply(left, right, x, kind, 2 * k, a, mid)
+        self._apply(left, right, x, kind, 2 * k + 1, mid, b)
+        self._update(k)
+
+    def chmin(self, left, right, x):
+        assert 0 <= left <= right <= self._n
+        if left < right:
+            self._apply(left, right, x, 0, 1, 0, self._size)
+
+    def chmax(self, left, right, x):
+        assert 0 <= left <= right <= self._n
+        if left < right:
+            self._apply(left, right, x, 1, 1, 0, self._size)
+
+    def add(self, left, right, x):
+        assert 0 <= left <= right <= self._n
+        if left < right:
+            self._apply(left, right, x, 2, 1, 0, self._size)
+
+    def _fold(self, left, right, d, op, e):
+        if left == right:
+            return e
+        left += self._size
+        right += self._size
+        self._push_down(left, right)
+        sm = e
+        while left < right:
+            if left & 1:
+                sm = op(sm, d[left])
+                left += 1
+            if right & 1:
+                right -= 1
+                sm = op(sm, d[right])
+            left >>= 1
+            right >>= 1
+        return sm
+
+    def sum(self, left, right):
+        assert 0 <= left <= right <= self._n
+        return self._fold(left, right, self._sum, operator.add, 0)
+
+    def max(self, left, right):
+        assert 0 <= left <= right <= self._n
+        return self._fold(left, right, self._max1, max, -self._INF)
+
+    def min(self, left, right):
+        assert 0 <= left <= right <= self._n
+        return self._fold(left, right, self._min1, min, self._INF)
@@ -0,0 +1,244 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SetConvolution:
+    """
+    添字の集合演算に関する畳み込みを行う。
+    長さ2**Kの数列A, Bから、長さ2**Kの数列Cを計算する。
+    c_k = sum_{i ○ j = k} a_i * b_j (○は xor, or, and のいずれか)
+    また、部分集合畳み込み
+    c_k = sum_{i | j = k, i & j = 0} a_i * b_j
+    も計算する。
+
+    長さが2べきでない場合は、0埋めして2べきに揃える。
+    NumPyがインストールされていて、かつ mod < 2**31 の場合は
+    各ビットの変換を配列演算で一括して行う。
+
+    Parameters
+    ----------
+    mod : int
+        畳み込みを計算する際の法
+
+    Attributes
+    ----------
+    _mod : int
+        畳み込みを計算する際の法
+    _use_np : bool
+        NumPyによる配列演算を用いるかどうかを表すbool値
+
+    Methods
+    -------
+    __init__(self, mod)
+        初期化
+    _prepare(self, a, b)
+        a, bをmodで割った余りにし、同じ2べきの長さに0埋めする
+        Returns
+        -------
+        (fa, fb, k) : tuple
+            _use_npの場合はnumpy.ndarray、そうでなければlist
+            長さは2**k
+    _zeta(self, a, k, upper)
+    _mobius(self, a, k, upper)
+        高速ゼータ変換／高速メビウス変換をaに施す（aは書き換えられる）
+        upper=Falseの場合は部分集合についての和（or畳み込み用）、
+        upper=Trueの場合は上位集合についての和（and畳み込み用）
+        aは最後の軸の長さが2**kのnumpy.ndarray、またはlist
+    _hadamard(self, a, k)
+        アダマール変換をaに施す（aは書き換えられる、逆変換の係数は掛けない）
+    _bitwise_convolution(self, a, b, upper)
+        or_convolution(upper=False), and_convolution(upper=True)の本体
+    xor_convolution(self, a, b)
+        c_k = sum_{i ^ j = k} a_i * b_j を計算する
+        modは奇数
+    or_convolution(self, a, b)
+        c_k = sum_{i | j = k} a_i * b_j を計算する
+    and_convolution(self, a, b)
+        c_k = sum_{i & j = k} a_i * b_j を計算する
+    subset_convolution(self, a, b)
+        c_k = sum_{i | j = k, i & j = 0} a_i * b_j を計算する
+        O(K^2 2^K)
+
+        Parameters
+        ----------
+        a, b : array_like
+            畳み込みを計算する対象となる2つの配列
+            (xor_convolution, or_convolution, and_convolutionも同様)
+
+        Returns
+        -------
+        list
+            配列a, bに対して畳み込みを計算した結果
+            長さはmax(len(a), len(b))以上の最小の2べき
+            a, bがともに空の場合は空のリスト
+    """
+    def __init__(self, mod):
+        self._mod = mod
+        self._use_np = np is not None and mod < 1 << 31
+
+    def _prepare(self, a, b):
+        mod = self._mod
+        k = (max(len(a), len(b)) - 1).bit_length()
+        fa = [x % mod for x in a] + [0] * ((1 << k) - len(a))
+        fb = [x % mod for x in b] + [0] * ((1 << k) - len(b))
+        if self._use_np:
+            fa = np.array(fa, dtype=np.int64)
+            fb = np.array(fb, dtype=np.int64)
+        return fa, fb, k
+
+    def _zeta(self, a, k, upper):
+        mod = self._mod
+        if self._use_np:
+            for i in range(k):
+                x = a.reshape(a.shape[:-1] + (-1, 2, 1 << i))
+                if upper:
+                    x[..., 0, :] += x[..., 1, :]
+                    x[..., 0, :] %= mod
+                else:
+                    x[..., 1, :] += x[..., 0, :]
+                    x[..., 1, :] %= mod
+            return
+
+        n = len(a)
+        for i in range(k):
+            w = 1 << i
+            for s in range(0, n, 2 * w):
+                if upper:
+                    for j in range(s, s + w):
+                        a[j] = (a[j] + a[j + w]) % mod
+                else:
+                    for j in range(s + w, s + 2 * w):
+                        a[j] = (a[j] + a[j - w]) % mod
+
+    def _mobius(self, a, k, upper):
+        mod = self._mod
+        if self._use_np:
+            for i in range(k):
+                x = a.reshape(a.shape[:-1] + (-1, 2, 1 << i))
+                if upper:
+                    x[..., 0, :] -= x[..., 1, :]
+                    x[..., 0, :] %= mod
+                else:
+                    x[..., 1, :] -= x[..., 0, :]
+                    x[..., 1, :] %= mod
+            return
+
+        n = len(a)
+        for i in range(k):
+            w = 1 << i
+            for s in range(0, n, 2 * w):
+                if upper:
+                    for j in range(s, s + w):
+                        a[j] = (a[j] - a[j + w]) % mod
+                else:
+                    for j in range(s + w, s + 2 * w):
+                        a[j] = (a[j] - a[j - w]) % mod
+
+    def _hadamard(self, a, k):
+        mod = self._mod
+        if self._use_np:
+            for i in range(k):
+                x = a.reshape(a.shape[:-1] + (-1, 2, 1 << i))
+                u = x[..., 0, :]
+                v = x[..., 1, :]
+                x[..., 0, :], x[..., 1, :] = (u + v) % mod, (u - v) % mod
+            return
+
+        n = len(a)
+        for i in range(k):
+            w = 1 << i
+            for s in range(0, n, 2 * w):
+                for j in range(s, s + w):
+                    u = a[j]
+                    v = a[j + w]
+                    a[j] = (u + v) % mod
+                    a[j + w] = (u - v) % mod
+
+    def xor_convolution(self, a, b):
+        if len(a) == 0 and len(b) == 0:
+            return []
+        mod = self._mod
+        assert mod % 2 == 1
+        fa, fb, k = self._prepare(a, b)
+        self._hadamard(fa, k)
+        self._hadamard(fb, k)
+        inv = pow(pow(2, k, mod), mod - 2, mod) if mod > 1 else 0
+        if self._use_np:
+            fa = fa * fb % mod
+        else:
+            fa = [x * y % mod for x, y in zip(fa, fb)]
+        self._hadamard(fa, k)
+        if self._use_np:
+            return (fa * inv % mod).tolist()
+        return [x * inv % mod for x in fa]
+
+    def _bitwise_convolution(self, a, b, upper):
+        if len(a) == 0 and len(b) == 0:
+            return []
+        mod = self._mod
+        fa, fb, k = self._prepare(a, b)
+        self._zeta(fa, k, upper)
+        self._zeta(fb, k, upper)
+        if self._use_np:
+            fa = fa * fb % mod
+        else:
+            fa = [x * y % mod for x, y in zip(fa, fb)]
+        self._mobius(fa, k, upper)
+        if self._use_np:
+            return fa.tolist()
+        return fa
+
+    def or_convolution(self, a, b):
+        return self._bitwise_convolution(a, b, False)
+
+    def and_convolution(self, a, b):
+        return self._bitwise_convolution(a, b, True)
+
+    def subset_convolution(self, a, b):
+        if len(a) == 0 and len(b) == 0:
+            return []
+        mod = self._mod
+        fa, fb, k = self._prepare(a, b)
+        n = 1 << k
+        pc = [0] * n
+        for i in range(1, n):
+            pc[i] = pc[i >> 1] + (i & 1)
+
+        if self._use_np:
+            pc = np.array(pc)
+            ra = np.zeros((k + 1, n), dtype=np.int64)
+            rb = np.zeros((k + 1, n), dtype=np.int64)
+            ra[pc, np.arange(n)] = fa
+            rb[pc, np.arange(n)] = fb
+            self._zeta(ra, k, False)
+            self._zeta(rb, k, False)
+            rc = np.zeros((k + 1, n), dtype=np.int64)
+            for r in range(k + 1):
+                for i in range(r + 1):
+                    rc[r] += ra[i] * rb[r - i] % mod
+                rc[r] %= mod
+            self._mobius(rc, k, False)
+            return rc[pc, np.arange(n)].tolist()
+
+        ra = [[0] * n for _ in range(k + 1)]
+        rb = [[0] * n for _ in range(k + 1)]
+        for i in range(n):
+            ra[pc[i]][i] = fa[i]
+            rb[pc[i]][i] = fb[i]
+        for r in range(k + 1):
+            self._zeta(ra[r], k, False)
+            self._zeta(rb[r], k, False)
+        rc = [[0] * n for _ in range(k + 1)]
+        for r in range(k + 1):
+            row = rc[r]
+            for i in range(r + 1):
+                x = ra[i]
+                y = rb[r - i]
+                for j in range(n):
+                    row[j] += x[j] * y[j]
+            for j in range(n):
+                row[j] %= mod
+            self._mobius(row, k, False)
+        return [rc[pc[i]][i] for i in range(n)]
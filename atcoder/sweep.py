@@ -0,0 +1,224 @@
+"""
+平面走査（sweep line）による長方形の集合に関する計算
+長方形はx1 <= x < x2, y1 <= y < y2を満たす点(x, y)の集合（半開区間）とし、
+4つの同じ長さの配列x1, y1, x2, y2で与える。
+y座標を座標圧縮し、x座標の順にイベントを処理する。
+"""
+
+
+class _CoverCountTree:
+    """
+    区間に被覆回数を加減し、被覆回数が1以上の部分の長さの合計を求める
+    セグメントツリー
+    加えた区間と同じ区間を後で取り除く（負の回数は生じない）使い方に限る。
+    この条件のもとでは遅延要素の伝播が不要になる。
+
+    Parameters
+    ----------
+    widths : list
+        各葉が表す区間の長さ
+
+    Attributes
+    ----------
+    _size : int
+        葉の数（2べき）
+    _log : int
+        _size == 2**x を満たすx
+    _cnt : list[int]
+        各ノードの区間全体を被覆している回数
+    _width : list
+        各ノードが表す区間の長さ
+    _len : list
+        各ノードの区間のうち、被覆されている部分の長さ
+
+    Methods
+    -------
+    add(self, left, right, v)
+        left番目～right-1番目の葉の被覆回数にvを加える
+    covered(self)
+        被覆回数が1以上の部分の長さの合計を返却する
+    """
+    def __init__(self, widths):
+        self._log = (len(widths) - 1).bit_length()
+        self._size = 1 << self._log
+        size = self._size
+        self._cnt = [0] * (2 * size)
+        self._width = [0] * (2 * size)
+        self._width[size:size + len(widths)] = widths
+        for k in range(size - 1, 0, -1):
+            self._width[k] = self._width[2 * k] + self._width[2 * k + 1]
+        self._len = [0] * (2 * size)
+
+    def add(self, left, right, v):
+        cnt = self._cnt
+        width = self._width
+        ln = self._len
+        size = self._size
+        left += size
+        right += size
+        lo, hi = left, right
+        while lo < hi:
+            if lo & 1:
+                cnt[lo] += v
+                if cnt[lo]:
+                    ln[lo] = width[lo]
+                else:
+                    ln[lo] = ln[2 * lo] + ln[2 * lo + 1] if lo < size else 0
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                cnt[hi] += v
+                if cnt[hi]:
+                    ln[hi] = width[hi]
+                else:
+                    ln[hi] = ln[2 * hi] + ln[2 * hi + 1] if hi < size else 0
+            lo >>= 1
+            hi >>= 1
+        right -= 1
+        for i in range(1, self._log + 1):
+            k = left >> i
+            if not cnt[k]:
+                ln[k] = ln[2 * k] + ln[2 * k + 1]
+            k = right >> i
+            if not cnt[k]:
+                ln[k] = ln[2 * k] + ln[2 * k + 1]
+
+    def covered(self):
+        return self._len[1]
+
+
+class _AddMaxTree:
+    """
+    区間加算と全体の最大値の取得だけを行うセグメントツリー
+    各ノードに、その区間全体に加えた値_add[k]と、
+    _mx[k] = _add[k] + max(_mx[2k], _mx[2k+1]) を持つ。
+    子に伝播させないので、更新は境界の祖先を葉に近い順に再計算するだけでよい。
+
+    Parameters
+    ----------
+    n : int
+        葉の数。値は全て0で初期化される。
+
+    Attributes
+    ----------
+    _size : int
+    _log : int
+        _CoverCountTreeを参照
+    _add : list[int]
+        各ノードの区間全体に加えた値
+    _mx : list[int]
+        各ノードの区間の最大値（祖先に加えた値は含まない）
+
+    Methods
+    -------
+    add(self, left, right, v)
+        left番目～right-1番目の葉にvを加える
+    all_max(self)
+        全体の最大値を返却する
+    """
+    def __init__(self, n):
+        self._log = (n - 1).bit_length()
+        self._size = 1 << self._log
+        self._add = [0] * (2 * self._size)
+        self._mx = [0] * (2 * self._size)
+
+    def add(self, left, right, v):
+        add = self._add
+        mx = self._mx
+        left += self._size
+        right += self._size
+        lo, hi = left, right
+        while lo < hi:
+            if lo & 1:
+                add[lo] += v
+                mx[lo] += v
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                add[hi] += v
+                mx[hi] += v
+            lo >>= 1
+            hi >>= 1
+        right -= 1
+        for i in range(1, self._log + 1):
+            k = left >> i
+            a = mx[2 * k]
+            b = mx[2 * k + 1]
+            mx[k] = add[k] + (a if a > b else b)
+            k = right >> i
+            a = mx[2 * k]
+            b = mx[2 * k + 1]
+            mx[k] = add[k] + (a if a > b else b)
+
+    def all_max(self):
+        return self._mx[1]
+
+
+def _events(x1, y1, x2, y2):
+    assert len(x1) == len(y1) == len(x2) == len(y2)
+    ys = sorted(set(y1) | set(y2))
+    idx = {y: i for i, y in enumerate(ys)}
+    events = []
+    for a, b, c, d in zip(x1, y1, x2, y2):
+        assert a <= c and b <= d
+        if a == c or b == d:
+            continue
+        events.append((a, 1, idx[b], idx[d]))
+        events.append((c, -1, idx[b], idx[d]))
+    events.sort()
+    return ys, events
+
+
+def rectangle_union_area(x1, y1, x2, y2):
+    """
+    長方形の和集合の面積を計算する。
+
+    Parameters
+    ----------
+    x1, y1, x2, y2 : list
+        i番目の長方形は x1[i] <= x < x2[i], y1[i] <= y < y2[i]
+        x1[i] <= x2[i], y1[i] <= y2[i] を満たす
+
+    Returns
+    -------
+    int or float
+        長方形の和集合の面積
+    """
+    ys, events = _events(x1, y1, x2, y2)
+    if not events:
+        return 0
+    tree = _CoverCountTree([ys[i + 1] - ys[i] for i in range(len(ys) - 1)])
+    area = 0
+    prev = events[0][0]
+    for x, v, lo, hi in events:
+        area += tree.covered() * (x - prev)
+        prev = x
+        tree.add(lo, hi, v)
+    return area
+
+
+def max_overlap(x1, y1, x2, y2):
+    """
+    1点を覆う長方形の個数の最大値を計算する。
+
+    Parameters
+    ----------
+    x1, y1, x2, y2 : list
+        rectangle_union_areaを参照
+
+    Returns
+    -------
+    int
+        max_{(x, y)} #{i | x1[i] <= x < x2[i], y1[i] <= y < y2[i]}
+    """
+    ys, events = _events(x1, y1, x2, y2)
+    if not events:
+        return 0
+    # 同じx座標では取り除くイベント(v=-1)が先に処理される
+    tree = _AddMaxTree(len(ys) - 1)
+    res = 0
+    for x, v, lo, hi in events:
+        tree.add(lo, hi, v)
+        if v > 0 and tree.all_max() > res:
+            res = tree.all_max()
+    return res
@@ -1,5 +1,7 @@
-from atcoder import Convolution
+from atcoder import Convolution, OnlineConvolution, convolution_ll, \
+    convolution_any_mod
 from random import randint
+import pytest
 
 
 NUMERIC_MAX_INT = 2**31 - 1
@@ -17,6 +19,16 @@ def conv_naive(a, b, mod):
     return c
 
 
+@pytest.fixture(params=[True, False])
+def use_numpy(request, monkeypatch):
+    import atcoder.convolution
+    if request.param:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(atcoder.convolution, 'np', None)
+    return request.param
+
+
 def test_convolution_empty():
     mod = 998244353
     conv = Convolution(mod)
@@ -64,3 +76,255 @@ def test_convolution_conv18433():
     a = [randint(0, mod-1) for i in range(1024)]
     b = [randint(0, mod-1) for i in range(1025)]
     assert conv_naive(a, b, mod) == conv.convolution(a, b)
+
+
+def test_convolution_numpy():
+    pytest.importorskip('numpy')
+    mod = 998244353
+    conv = Convolution(mod)
+    assert conv._use_np
+    a = [randint(0, NUMERIC_MAX_INT) for i in range(1234)]
+    b = [randint(0, NUMERIC_MAX_INT) for i in range(2345)]
+    assert conv_naive(a, b, mod) == conv.convolution(a, b)
+
+
+@pytest.mark.parametrize("use_numpy", [False], indirect=True)
+def test_convolution_without_numpy(use_numpy):
+    mod = 998244353
+    conv = Convolution(mod)
+    assert not conv._use_np
+    a = [randint(0, mod - 1) for i in range(100)]
+    b = [randint(0, mod - 1) for i in range(200)]
+    assert conv_naive(a, b, mod) == conv.convolution(a, b)
+
+
+def test_convolution_shared_root_table():
+    mod = 998244353
+    conv1 = Convolution(mod)
+    conv2 = Convolution(mod)
+    assert conv1._table is conv2._table
+    assert Convolution(924844033)._table is not conv1._table
+    a = [randint(0, mod - 1) for i in range(100)]
+    b = [randint(0, mod - 1) for i in range(100)]
+    assert conv1.convolution(a[:], b[:]) == conv2.convolution(a, b)
+
+
+def test_convolution_ll():
+    # |c_i| <= 10**17 * 10**6 * 100 < M1 * M2 * M3 / 2
+    a = [randint(-10**17, 10**17) for i in range(100)]
+    b = [randint(-10**6, 10**6) for i in range(150)]
+    expected = [0] * (len(a) + len(b) - 1)
+    for i in range(len(a)):
+        for j in range(len(b)):
+            expected[i + j] += a[i] * b[j]
+    assert expected == convolution_ll(a, b)
+    assert [] == convolution_ll([], b)
+    assert [-6] == convolution_ll([2], [-3])
+    bound = (754974721 * 167772161 * 469762049 - 1) // 2
+    assert [bound, -bound] == convolution_ll([bound, -bound], [1])
+    assert [-bound, bound] == convolution_ll([-1], [bound, -bound])
+
+
+def test_convolution_any_mod(use_numpy):
+    for mod in [10**9 + 7, 2**31 + 11, 2, 1]:
+        a = [randint(-NUMERIC_MAX_INT, NUMERIC_MAX_INT) for i in range(100)]
+        b = [randint(0, mod - 1) for i in range(70)]
+        assert conv_naive(a, b, mod) == convolution_any_mod(a, b, mod)
+    assert [] == convolution_any_mod([1], [], 10**9 + 7)
+
+
+@pytest.mark.parametrize("engine", [
+    '_convolution_naive', '_convolution_kronecker', '_convolution_ntt',
+    '_convolution_np',
+])
+def test_convolution_engines(engine):
+    if engine == '_convolution_np':
+        pytest.importorskip('numpy')
+    for mod in [998244353, 641]:
+        conv = Convolution(mod)
+        for n, m in [(1, 1), (1, 5), (7, 3), (50, 61)]:
+            a = [randint(-NUMERIC_MAX_INT, NUMERIC_MAX_INT) for i in range(n)]
+            b = [randint(0, NUMERIC_MAX_INT) for i in range(m)]
+            assert conv_naive(a, b, mod) == getattr(conv, engine)(a, b)
+
+
+@pytest.mark.parametrize("use_numpy", [False], indirect=True)
+def test_convolution_dispatch_without_numpy(monkeypatch, use_numpy):
+    monkeypatch.setattr(Convolution, '_NTT_THRESHOLD', 100)
+    mod = 998244353
+    conv = Convolution(mod)
+    for n, m in [(8, 300), (9, 300), (100, 100), (101, 200)]:
+        a = [randint(0, mod - 1) for i in range(n)]
+        b = [randint(0, mod - 1) for i in range(m)]
+        assert conv_naive(a, b, mod) == conv.convolution(a, b)
+
+
+@pytest.mark.parametrize("engine", [
+    '_convolution_naive', '_convolution_kronecker', '_convolution_ntt',
+    '_convolution_np',
+])
+def test_convolution_keeps_input(engine):
+    if engine == '_convolution_np':
+        pytest.importorskip('numpy')
+    mod = 998244353
+    conv = Convolution(mod)
+    for n, m in [(100, 200), (3, 5), (70, 70)]:
+        a = [randint(0, mod - 1) for i in range(n)]
+        b = [randint(0, mod - 1) for i in range(m)]
+        a0, b0 = a[:], b[:]
+        assert conv_naive(a, b, mod) == getattr(conv, engine)(a, b)
+        assert a == a0 and b == b0
+
+
+def test_convolution_inplace():
+    mod = 998244353
+    conv = Convolution(mod)
+    a = [randint(0, mod - 1) for i in range(100)]
+    b = [randint(0, mod - 1) for i in range(200)]
+    expected = conv_naive(a, b, mod)
+    assert expected == conv.convolution(a[:], b[:], inplace=True)
+    c = conv._convolution_ntt(a, b, inplace=True)
+    assert c is a
+    assert expected == c
+
+
+@pytest.mark.parametrize("use_numpy", [False], indirect=True)
+def test_convolution_inplace_square(monkeypatch, use_numpy):
+    monkeypatch.setattr(Convolution, '_NTT_THRESHOLD', 50)
+    mod = 998244353
+    conv = Convolution(mod)
+    a = [randint(0, mod - 1) for i in range(100)]
+    expected = conv_naive(a, a, mod)
+    assert expected == conv.convolution(a[:], a[:])
+    c = conv.convolution(a, a, inplace=True)
+    assert expected == c
+    assert c is a
+
+
+def test_convolution_ntt_intt(use_numpy):
+    mod = 998244353
+    conv = Convolution(mod)
+    a = [randint(0, mod - 1) for i in range(100)]
+    b = [randint(0, mod - 1) for i in range(150)]
+    fa = conv.ntt(a, 256)
+    fb = conv.ntt(b, 256)
+    assert len(fa) == 256
+    assert conv_naive(a, b, mod) == \
+        conv.intt([x * y % mod for x, y in zip(fa, fb)])[:249]
+    assert a == conv.intt(conv.ntt(a))[:100]
+
+
+def test_convolution_prepared_kernel(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(Convolution, '_NTT_THRESHOLD', 100)
+    mod = 998244353
+    conv = Convolution(mod)
+    b = [randint(0, NUMERIC_MAX_INT) for i in range(300)]
+    kernel = conv.prepare(b)
+    for n in [0, 1, 5, 50, 200, 1200, 1200]:
+        a = [randint(0, NUMERIC_MAX_INT) for i in range(n)]
+        assert conv.convolution(a, b) == kernel.convolution(a)
+
+
+def test_convolution_convolve_many(monkeypatch, use_numpy):
+    monkeypatch.setattr(Convolution, '_BATCH_SIZE', 1024)
+    mod = 998244353
+    conv = Convolution(mod)
+    pairs = []
+    for n, m in [(0, 3), (3, 5), (70, 200), (150, 120), (200, 70), (1, 1),
+                 (130, 140), (700, 300)]:
+        a = [randint(0, NUMERIC_MAX_INT) for i in range(n)]
+        b = [randint(0, NUMERIC_MAX_INT) for i in range(m)]
+        pairs.append((a, b))
+    expected = [conv_naive(a, b, mod) if a and b else [] for a, b in pairs]
+    assert expected == conv.convolve_many(pairs)
+    assert [] == conv.convolve_many([])
+
+
+def test_convolution_limit(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(Convolution, '_NTT_THRESHOLD', 100)
+    mod = 998244353
+    conv = Convolution(mod)
+    for n, m in [(1, 1), (5, 300), (300, 700), (1000, 1000)]:
+        a = [randint(0, NUMERIC_MAX_INT) for i in range(n)]
+        b = [randint(0, NUMERIC_MAX_INT) for i in range(m)]
+        expected = conv_naive(a, b, mod)
+        for limit in [0, 1, 7, 200, 500, n + m - 1, n + m + 5]:
+            assert expected[:limit] == conv.convolution(a, b, limit=limit)
+
+
+def test_convolution_middle_product(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(Convolution, '_NTT_THRESHOLD', 100)
+    mod = 998244353
+    conv = Convolution(mod)
+    for n, m in [(1, 1), (5, 5), (300, 5), (300, 200), (2000, 1000)]:
+        a = [randint(0, NUMERIC_MAX_INT) for i in range(n)]
+        b = [randint(0, NUMERIC_MAX_INT) for i in range(m)]
+        expected = [
+            sum(a[i + j] * b[j] for j in range(m)) % mod
+            for i in range(n - m + 1)
+        ]
+        assert expected == conv.middle_product(a, b)
+
+
+def test_online_convolution():
+    mod = 998244353
+    g = [randint(0, mod - 1) for i in range(300)]
+    f = [randint(0, NUMERIC_MAX_INT) for i in range(500)]
+    expected = conv_naive(f, g, mod)[:500]
+    oc = OnlineConvolution(mod, g)
+    assert expected == [oc.push(x) for x in f]
+
+    oc = OnlineConvolution(mod, [])
+    assert [0, 0] == [oc.push(1), oc.push(2)]
+
+
+def test_online_convolution_recurrence():
+    # f_0 = 1, f_i = sum_{j=0}^{i-1} f_j * g_{i-j}
+    mod = 998244353
+    n = 300
+    g = [0] + [randint(0, mod - 1) for i in range(n - 1)]
+    f = [1]
+    for i in range(1, n):
+        f.append(sum(f[j] * g[i - j] for j in range(i)) % mod)
+    oc = OnlineConvolution(mod, g[1:])
+    x = [1]
+    for i in range(1, n):
+        x.append(oc.push(x[-1]))
+    assert f == x
+
+
+def test_cyclic_convolution(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(Convolution, '_NTT_THRESHOLD', 100)
+    mod = 998244353
+    conv = Convolution(mod)
+    for n, m, length in [(1, 1, 1), (5, 7, 3), (100, 100, 100),
+                         (512, 512, 512), (1500, 700, 1024),
+                         (300, 2000, 1000)]:
+        a = [randint(0, NUMERIC_MAX_INT) for i in range(n)]
+        b = [randint(0, NUMERIC_MAX_INT) for i in range(m)]
+        expected = [0] * length
+        for i, x in enumerate(conv_naive(a, b, mod)):
+            expected[i % length] = (expected[i % length] + x) % mod
+        assert expected == conv.cyclic_convolution(a, b, length)
+
+
+def test_convolution_2d():
+    mod = 998244353
+    conv = Convolution(mod)
+    for n1, n2, m1, m2 in [(1, 1, 1, 1), (3, 4, 5, 2), (20, 30, 10, 15)]:
+        a = [[randint(0, mod - 1) for j in range(n2)] for i in range(n1)]
+        b = [[randint(0, mod - 1) for j in range(m2)] for i in range(m1)]
+        expected = [[0] * (n2 + m2 - 1) for i in range(n1 + m1 - 1)]
+        for i1 in range(n1):
+            for j1 in range(n2):
+                for i2 in range(m1):
+                    for j2 in range(m2):
+                        expected[i1 + i2][j1 + j2] += a[i1][j1] * b[i2][j2]
+        expected = [[x % mod for x in row] for row in expected]
+        assert expected == conv.convolution_2d(a, b)
+    assert [] == conv.convolution_2d([], [[1]])
+    assert [[], []] == conv.convolution_2d([[]], [[], []])
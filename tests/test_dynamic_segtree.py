@@ -0,0 +1,93 @@
+from atcoder import DynamicSegTree, SegTree
+from random import randint
+import pytest
+
+
+def op(a, b):
+    assert a == '$' or b == '$' or a <= b
+    if a == '$':
+        return b
+    if b == '$':
+        return a
+    return a+b
+
+
+def e():
+    return '$'
+
+
+def test_zero():
+    s = DynamicSegTree(op, e, 0, 0)
+    assert '$' == s.all_prod()
+    assert '$' == s.prod(0, 0)
+    s = DynamicSegTree(op, e, -10**18, 10**18)
+    assert '$' == s.all_prod()
+    assert '$' == s.get(12345)
+
+
+def test_invalid():
+    s = DynamicSegTree(op, e, -3, 7)
+    with pytest.raises(AssertionError):
+        s.get(7)
+    with pytest.raises(AssertionError):
+        s.set(-4, 'a')
+    with pytest.raises(AssertionError):
+        s.prod(3, 2)
+    with pytest.raises(AssertionError):
+        s.prod(-4, 2)
+    with pytest.raises(AssertionError):
+        DynamicSegTree(op, e, 1, 0)
+
+
+def test_compare_segtree():
+    for n in range(1, 20):
+        lo = randint(-10, 10)
+        seg0 = SegTree(op, e, n=n)
+        seg1 = DynamicSegTree(op, e, lo, lo + n)
+        for i in range(n):
+            if randint(0, 1):
+                seg0.set(i, chr(ord('a') + i))
+                seg1.set(lo + i, chr(ord('a') + i))
+        assert seg0.all_prod() == seg1.all_prod()
+        for i in range(n):
+            assert seg0.get(i) == seg1.get(lo + i)
+        for left in range(n + 1):
+            for right in range(left, n + 1):
+                assert seg0.prod(left, right) == \
+                    seg1.prod(lo + left, lo + right)
+        for left in range(n + 1):
+            for right in range(left, n + 1):
+                y = seg0.prod(left, right)
+
+                def leq_y(x):
+                    return x == '$' or y == '$' or len(x) <= len(y)
+
+                assert seg0.max_right(left, leq_y) + lo == \
+                    seg1.max_right(lo + left, leq_y)
+                assert seg0.min_left(right, leq_y) + lo == \
+                    seg1.min_left(lo + right, leq_y)
+
+
+def test_huge_range():
+    hi = 10**18
+    s = DynamicSegTree(lambda a, b: a + b, lambda: 0, 0, hi)
+    naive = {}
+    for _ in range(200):
+        p = randint(0, hi - 1)
+        x = randint(0, 10**9)
+        s.set(p, x)
+        naive[p] = x
+    ps = sorted(naive)
+    assert sum(naive.values()) == s.all_prod()
+    for _ in range(100):
+        left = randint(0, hi)
+        right = randint(left, hi)
+        assert sum(x for p, x in naive.items() if left <= p < right) == \
+            s.prod(left, right)
+    for p in ps:
+        assert naive[p] == s.get(p)
+    total = sum(naive[p] for p in ps[:10])
+    assert ps[10] == s.max_right(0, lambda x: x <= total)
+    total = sum(naive[p] for p in ps[-10:])
+    assert ps[-11] + 1 == s.min_left(hi, lambda x: x <= total)
+    assert len(s._d) <= 2 + 200 * 60
@@ -1,4 +1,6 @@
-from atcoder import FenwickTree
+from atcoder import FenwickTree, FenwickTree2D, CompressedFenwickTree2D, \
+    RangeFenwickTree, FenwickMultiset
+from random import randint
 import pytest
 
 NUMERIC_MAX_INT = 2**31 - 1
@@ -84,3 +86,179 @@ def test_bound():
 # def test_overflow():
 # def test_int128():
 # 実装しない
+
+
+def test_2d_naive():
+    for h in range(6):
+        for w in range(6):
+            fw = FenwickTree2D(h, w)
+            a = [[0] * w for _ in range(h)]
+            for _ in range(h * w):
+                x = randint(0, h - 1)
+                y = randint(0, w - 1)
+                v = randint(-10, 10)
+                fw.add(x, y, v)
+                a[x][y] += v
+            for x1 in range(h + 1):
+                for x2 in range(x1, h + 1):
+                    for y1 in range(w + 1):
+                        for y2 in range(y1, w + 1):
+                            total = sum(a[x][y] for x in range(x1, x2)
+                                        for y in range(y1, y2))
+                            assert total == fw.sum(x1, y1, x2, y2)
+
+
+def test_2d_invalid():
+    with pytest.raises(AssertionError):
+        FenwickTree2D(-1, 3)
+    fw = FenwickTree2D(3, 4)
+    with pytest.raises(AssertionError):
+        fw.add(3, 0, 1)
+    with pytest.raises(AssertionError):
+        fw.add(0, 4, 1)
+    with pytest.raises(AssertionError):
+        fw.sum(0, 2, 3, 1)
+
+
+def test_compressed_2d_naive():
+    for n in range(30):
+        xs = [randint(-10**9, 10**9) if randint(0, 1) else randint(-3, 3)
+              for _ in range(n)]
+        ys = [randint(-10**9, 10**9) if randint(0, 1) else randint(-3, 3)
+              for _ in range(n)]
+        fw = CompressedFenwickTree2D(xs, ys)
+        value = {}
+        for _ in range(2 * n):
+            i = randint(0, n - 1)
+            v = randint(-10, 10)
+            fw.add(xs[i], ys[i], v)
+            value[xs[i], ys[i]] = value.get((xs[i], ys[i]), 0) + v
+        coords = [-10**9 - 1, -4, 0, 2, 4, 10**9 + 1] + xs + ys
+        for _ in range(100):
+            x1, x2 = sorted((coords[randint(0, len(coords) - 1)],
+                             coords[randint(0, len(coords) - 1)]))
+            y1, y2 = sorted((coords[randint(0, len(coords) - 1)],
+                             coords[randint(0, len(coords) - 1)]))
+            total = sum(v for (x, y), v in value.items()
+                        if x1 <= x < x2 and y1 <= y < y2)
+            assert total == fw.sum(x1, y1, x2, y2)
+
+
+def test_compressed_2d_invalid():
+    fw = CompressedFenwickTree2D([0, 5], [1, 7])
+    with pytest.raises(AssertionError):
+        fw.add(1, 1, 1)
+    with pytest.raises(AssertionError):
+        fw.add(0, 2, 1)
+    with pytest.raises(AssertionError):
+        fw.sum(5, 0, 0, 1)
+
+
+def test_from_list():
+    for n in range(51):
+        v = [randint(-10**20, 10**20) for _ in range(n)]
+        fw0 = FenwickTree(n)
+        for i in range(n):
+            fw0.add(i, v[i])
+        fw1 = FenwickTree.from_list(v)
+        assert fw0._data == fw1._data
+        if n:
+            fw1.add(n // 2, 1)
+        for left in range(n+1):
+            for right in range(left, n+1):
+                total = sum(v[left:right])
+                if left <= n // 2 < right:
+                    total += 1
+                assert total == fw1.sum(left, right)
+
+
+def test_range_naive():
+    for n in range(30):
+        for fw, a in [(RangeFenwickTree(n), [0] * n),
+                      (RangeFenwickTree.from_list(list(range(n))),
+                       list(range(n)))]:
+            for _ in range(n):
+                left = randint(0, n)
+                right = randint(left, n)
+                x = randint(-10**9, 10**9)
+                fw.add(left, right, x)
+                for i in range(left, right):
+                    a[i] += x
+            for left in range(n+1):
+                for right in range(left, n+1):
+                    assert sum(a[left:right]) == fw.sum(left, right)
+
+
+@pytest.mark.parametrize("p", [
+    [-1, 3],
+    [3, 11],
+    [5, 3]
+])
+def test_range_invalid(p):
+    fw = RangeFenwickTree(10)
+    with pytest.raises(AssertionError):
+        fw.sum(*p)
+    with pytest.raises(AssertionError):
+        fw.add(*p, 1)
+
+
+def test_range_overflow():
+    fw = RangeFenwickTree(10)
+    with pytest.raises(OverflowError):
+        fw.add(0, 5, 2**62)
+
+
+def test_lower_bound():
+    for n in range(40):
+        v = [randint(0, 3) for _ in range(n)]
+        fw = FenwickTree.from_list(v)
+        total = sum(v)
+        for w in range(-1, total + 3):
+            p = 0
+            while p < n and sum(v[:p + 1]) < w:
+                p += 1
+            assert (0 if w <= 0 else p) == fw.lower_bound(w)
+        for k in range(total + 2):
+            p = 0
+            while p < n and sum(v[:p + 1]) <= k:
+                p += 1
+            assert p == fw.kth(k)
+
+
+def test_multiset():
+    universe = [randint(-10**18, 10**18) for _ in range(20)] + [5, 5]
+    ms = FenwickMultiset(universe)
+    naive = []
+    for _ in range(500):
+        x = universe[randint(0, len(universe) - 1)]
+        if randint(0, 2) and naive.count(x):
+            ms.remove(x)
+            naive.remove(x)
+        else:
+            k = randint(0, 2)
+            ms.add(x, k)
+            naive += [x] * k
+        naive.sort()
+        assert len(naive) == len(ms)
+        assert naive.count(x) == ms.count(x)
+        y = randint(-10**18, 10**18)
+        assert sum(1 for z in naive if z < y) == ms.count_less(y)
+        assert sum(1 for z in naive if z < x) == ms.count_less(x)
+        for k in range(len(naive)):
+            assert naive[k] == ms.kth(k)
+    assert 0 == ms.count(10**19)
+
+
+def test_multiset_invalid():
+    ms = FenwickMultiset([1, 2, 3])
+    with pytest.raises(AssertionError):
+        ms.add(4)
+    with pytest.raises(AssertionError):
+        ms.remove(1)
+    with pytest.raises(AssertionError):
+        ms.kth(0)
+    ms.add(2)
+    with pytest.raises(AssertionError):
+        ms.kth(1)
+    with pytest.raises(AssertionError):
+        ms.remove(2, 2)
@@ -0,0 +1,108 @@
+from atcoder import FPS
+from random import randint
+import pytest
+
+
+MOD = 998244353
+
+
+def mul_naive(a, b, n):
+    c = [0] * n
+    for i in range(min(len(a), n)):
+        for j in range(min(len(b), n - i)):
+            c[i + j] = (c[i + j] + a[i] * b[j]) % MOD
+    return c
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 10, 64, 150])
+def test_inv(n):
+    fps = FPS(MOD)
+    a = [randint(1, MOD - 1)] + [randint(0, MOD - 1) for i in range(n - 1)]
+    assert [1] + [0] * (n - 1) == mul_naive(a, fps.inv(a), n)
+    assert [1] + [0] * (2 * n - 1) == mul_naive(a, fps.inv(a, 2 * n), 2 * n)
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 64, 150])
+def test_log_exp(n):
+    fps = FPS(MOD)
+    a = [0] + [randint(0, MOD - 1) for i in range(n - 1)]
+    b = fps.exp(a)
+    assert n == len(b)
+    assert 1 == b[0]
+    # exp(a)' = a' * exp(a)
+    da = [a[i] * i % MOD for i in range(1, n)]
+    db = [b[i] * i % MOD for i in range(1, n)]
+    assert db == mul_naive(da, b, n - 1)
+    assert a == fps.log(b)
+
+
+def test_exp_known():
+    fps = FPS(MOD)
+    # exp(x) = sum x^i / i!
+    fact = 1
+    expected = []
+    for i in range(10):
+        expected.append(pow(fact, MOD - 2, MOD))
+        fact = fact * (i + 1) % MOD
+    assert expected == fps.exp([0, 1], 10)
+    assert [1, 0, 0] == fps.exp([], 3)
+
+
+@pytest.mark.parametrize("k", [0, 1, 2, 3, 10, 10**18])
+def test_pow(k):
+    fps = FPS(MOD)
+    n = 40
+    for a in [[randint(0, MOD - 1) for i in range(n)],
+              [0, 0] + [randint(0, MOD - 1) for i in range(n - 2)],
+              [0] * n]:
+        expected = [1] + [0] * (n - 1)
+        b = a
+        e = k
+        while e and any(b):
+            if e & 1:
+                expected = mul_naive(expected, b, n)
+            b = mul_naive(b, b, n)
+            e >>= 1
+        if e and not any(b):
+            expected = [0] * n
+        assert expected == fps.pow(a, k)
+
+
+def test_sqrt():
+    fps = FPS(MOD)
+    n = 100
+    g = [randint(1, MOD - 1)] + [randint(0, MOD - 1) for i in range(n - 1)]
+    a = mul_naive(g, g, n)
+    h = fps.sqrt(a)
+    assert a == mul_naive(h, h, n)
+
+    a = [0, 0, 0, 0] + a[:n - 4]
+    h = fps.sqrt(a)
+    assert a == mul_naive(h, h, n)
+
+    assert fps.sqrt([0, 1, 2]) is None
+    assert fps.sqrt([3, 1, 2]) is None  # 3 is not a quadratic residue
+    assert [0, 0] == fps.sqrt([0, 0])
+
+
+@pytest.mark.parametrize(("n", "m"), [(1, 1), (10, 3), (3, 10), (100, 40)])
+def test_divmod(n, m):
+    fps = FPS(MOD)
+    f = [randint(0, MOD - 1) for i in range(n)]
+    g = [randint(0, MOD - 1) for i in range(m - 1)] + [randint(1, MOD - 1)]
+    q, r = fps.divmod(f, g)
+    assert max(n - m + 1, 0) == len(q)
+    assert min(n, m - 1) == len(r)
+    qg = mul_naive(q, g, n)
+    assert f == [(qg[i] + (r[i] if i < len(r) else 0)) % MOD
+                 for i in range(n)]
+
+
+def test_without_numpy(monkeypatch):
+    import atcoder.convolution
+    monkeypatch.setattr(atcoder.convolution, 'np', None)
+    fps = FPS(MOD)
+    n = 200
+    a = [1] + [randint(0, MOD - 1) for i in range(n - 1)]
+    assert [1] + [0] * (n - 1) == mul_naive(a, fps.inv(a), n)
+    assert a == fps.exp(fps.log(a))
@@ -1,4 +1,4 @@
-from atcoder import LazySegTree
+from atcoder import LazySegTree, ValueLazySegTree
 import pytest
 
 
@@ -104,3 +104,43 @@ def test_lazysegtree_usage():
     seg.apply(2, -10)
     assert -5 == seg.prod(2, 3)
     assert 0 == seg.prod(2, 4)
+
+
+def test_value_lazysegtree_usage():
+    seg = ValueLazySegTree(op=op_ss, e=-1_000_000_000, mapping=op_ts,
+                           composition=op_tt, id=0, v=[0] * 10)
+    assert 0 == seg.all_prod()
+    seg.apply_lr(0, 3, 5)
+    assert 5 == seg.all_prod()
+    seg.apply(2, -10)
+    assert -5 == seg.prod(2, 3)
+    assert 0 == seg.prod(2, 4)
+    assert -1_000_000_000 == seg.prod(4, 4)
+    assert [5, -5, 0] == seg.prod_many([0, 2, 3], [2, 3, 10])
+    with pytest.raises(AssertionError):
+        seg.prod(3, 11)
+
+
+@pytest.mark.parametrize("value", [False, True])
+def test_lazysegtree_push_stats(value):
+    if value:
+        seg = ValueLazySegTree(op=op_ss, e=-1_000_000_000, mapping=op_ts,
+                               composition=op_tt, id=0, v=[0] * 16)
+    else:
+        seg = starry_seg(v=[0] * 16)
+    assert (0, 0) == seg.push_stats()
+    for i in range(16):
+        assert 0 == seg.get(i)
+    pushed, skipped = seg.push_stats()
+    assert 0 == pushed
+    assert 16 * 4 == skipped
+
+    seg.apply_lr(0, 16, 3)
+    assert 3 == seg.get(5)
+    pushed, skipped2 = seg.push_stats()
+    assert 4 == pushed
+    assert skipped == skipped2
+    assert 3 == seg.get(4)
+    pushed, skipped3 = seg.push_stats()
+    assert 4 == pushed
+    assert skipped + 4 == skipped3
@@ -1,5 +1,6 @@
-from atcoder import LazySegTree
+from atcoder import LazySegTree, ValueLazySegTree
 import random
+import pytest
 from tests.utils.random import randpair
 
 
@@ -81,10 +82,21 @@ def seg(n=0, v=[]):
     return s
 
 
-def test_lazysegtree_naivetest_stress():
+def value_seg(n=0, v=[]):
+    return ValueLazySegTree(op=op_ss,
+                            e=e_s(),
+                            mapping=op_ts,
+                            composition=op_tt,
+                            id=e_t(),
+                            n=n,
+                            v=v)
+
+
+@pytest.mark.parametrize("make", [seg, value_seg])
+def test_lazysegtree_naivetest_stress(make):
     for n in range(1, 31):
         for ph in range(0, 10):
-            seg0 = seg(n=n)
+            seg0 = make(n=n)
             tm = TimeManager(n)
             for i in range(n):
                 seg0.set(i, S(i, i+1, -1))
@@ -114,10 +126,11 @@ def test_lazysegtree_naivetest_stress():
                     assert False
 
 
-def test_lazysegtree_maxright_stress():
+@pytest.mark.parametrize("make", [seg, value_seg])
+def test_lazysegtree_maxright_stress(make):
     for n in range(1, 31):
         for ph in range(0, 10):
-            seg0 = seg(n=n)
+            seg0 = make(n=n)
             tm = TimeManager(n)
             for i in range(n):
                 seg0.set(i, S(i, i+1, -1))
@@ -139,10 +152,11 @@ def test_lazysegtree_maxright_stress():
                     tm.action(left, right, now)
 
 
-def test_lazysegtree_minleft_stress():
+@pytest.mark.parametrize("make", [seg, value_seg])
+def test_lazysegtree_minleft_stress(make):
     for n in range(1, 31):
         for ph in range(0, 10):
-            seg0 = seg(n=n)
+            seg0 = make(n=n)
             tm = TimeManager(n)
             for i in range(n):
                 seg0.set(i, S(i, i+1, -1))
@@ -162,3 +176,33 @@ def test_lazysegtree_minleft_stress():
                     now += 1
                     seg0.apply_lr(left, right, T(now))
                     tm.action(left, right, now)
+
+
+@pytest.mark.parametrize("make", [seg, value_seg])
+def test_lazysegtree_prod_many_stress(make):
+    for n in range(1, 31):
+        seg0 = make(n=n)
+        tm = TimeManager(n)
+        for i in range(n):
+            seg0.set(i, S(i, i+1, -1))
+        now = 0
+        for q in range(100):
+            now += 1
+            left, right = randpair(0, n)
+            seg0.apply_lr(left, right, T(now))
+            tm.action(left, right, now)
+            lefts = []
+            rights = []
+            for _ in range(10):
+                left, right = randpair(0, n)
+                lefts.append(left)
+                rights.append(right)
+            lefts.append(n)
+            rights.append(n)
+            res = seg0.prod_many(lefts, rights)
+            assert len(res) == len(lefts)
+            for left, right, x in zip(lefts[:-1], rights[:-1], res):
+                assert left == x.left
+                assert right == x.right
+                assert tm.prod(left, right) == x.time
+            assert res[-1].left == -1
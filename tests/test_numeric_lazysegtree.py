@@ -0,0 +1,129 @@
+from atcoder import AddSumLazySegTree, AddMinLazySegTree, AddMaxLazySegTree, \
+    AssignSumLazySegTree, AssignMinLazySegTree, AssignMaxLazySegTree, \
+    AffineSumLazySegTree, SegTree
+from random import randint
+import pytest
+
+
+MOD = 998244353
+INF = (1 << 63) - 1
+
+
+def add_sum(x, f):
+    return x + f
+
+
+def add_inf(x, f):
+    return x if abs(x) == INF or x == -INF - 1 else x + f
+
+
+def assign(x, f):
+    return f
+
+
+def affine(x, f):
+    return (f[0] * x + f[1]) % MOD
+
+
+def rand_affine():
+    return (randint(0, MOD - 1), randint(0, MOD - 1))
+
+
+def rand_int():
+    return randint(-10**9, 10**9)
+
+
+def rand_mod():
+    return randint(0, MOD - 1)
+
+
+KINDS = [
+    (AddSumLazySegTree, sum, 0, add_sum, rand_int, rand_int),
+    (AddMinLazySegTree, min, INF, add_inf, rand_int, rand_int),
+    (AddMaxLazySegTree, max, -INF - 1, add_inf, rand_int, rand_int),
+    (AssignSumLazySegTree, sum, 0, assign, rand_int, rand_int),
+    (AssignMinLazySegTree, min, INF, assign, rand_int, rand_int),
+    (AssignMaxLazySegTree, max, -INF - 1, assign, rand_int, rand_int),
+    (lambda n=0, v=[]: AffineSumLazySegTree(MOD, n=n, v=v),
+     lambda x: sum(x) % MOD, 0, affine, rand_mod, rand_affine),
+]
+
+
+def fold(agg, e, v):
+    return agg(v) if v else e
+
+
+@pytest.mark.parametrize(("cls", "agg", "e", "mapping", "rand_s", "rand_f"),
+                         KINDS)
+def test_zero(cls, agg, e, mapping, rand_s, rand_f):
+    assert e == cls(0).all_prod()
+    assert e == cls().all_prod()
+    assert e == cls(10).all_prod()
+
+
+@pytest.mark.parametrize(("cls", "agg", "e", "mapping", "rand_s", "rand_f"),
+                         KINDS)
+def test_invalid(cls, agg, e, mapping, rand_s, rand_f):
+    with pytest.raises(AssertionError):
+        cls(n=-1)
+    s = cls(10)
+    with pytest.raises(AssertionError):
+        s.get(10)
+    with pytest.raises(AssertionError):
+        s.prod(3, 2)
+    with pytest.raises(AssertionError):
+        s.apply_lr(0, 11, rand_f())
+
+
+@pytest.mark.parametrize(("cls", "agg", "e", "mapping", "rand_s", "rand_f"),
+                         KINDS)
+def test_compare_naive(cls, agg, e, mapping, rand_s, rand_f):
+    for n in range(1, 20):
+        for use_v in [False, True]:
+            v = [rand_s() for _ in range(n)] if use_v else [e] * n
+            seg = cls(v=v) if use_v else cls(n=n)
+            for _ in range(100):
+                ty = randint(0, 4)
+                left = randint(0, n)
+                right = randint(left, n)
+                if ty == 0:
+                    assert fold(agg, e, v[left:right]) == seg.prod(left, right)
+                elif ty == 1:
+                    p = randint(0, n - 1)
+                    assert v[p] == seg.get(p)
+                elif ty == 2:
+                    p = randint(0, n - 1)
+                    x = rand_s()
+                    v[p] = x
+                    seg.set(p, x)
+                elif ty == 3:
+                    p = randint(0, n - 1)
+                    f = rand_f()
+                    v[p] = mapping(v[p], f)
+                    seg.apply(p, f)
+                else:
+                    f = rand_f()
+                    for i in range(left, right):
+                        v[i] = mapping(v[i], f)
+                    seg.apply_lr(left, right, f)
+                assert fold(agg, e, v) == seg.all_prod()
+            seg0 = SegTree(lambda a, b: agg([a, b]), lambda: e, v=v)
+            for left in range(n + 1):
+                for right in range(left, n + 1):
+                    y = seg0.prod(left, right)
+
+                    def g(x):
+                        return x == e or x <= y
+
+                    assert seg0.max_right(left, g) == seg.max_right(left, g)
+                    assert seg0.min_left(right, g) == seg.min_left(right, g)
+            lefts = [randint(0, n) for _ in range(10)]
+            rights = [randint(x, n) for x in lefts]
+            assert seg.prod_many(lefts, rights) == \
+                [fold(agg, e, v[x:y]) for x, y in zip(lefts, rights)]
+
+
+def test_overflow():
+    s = AddSumLazySegTree(v=[0, (1 << 62)])
+    with pytest.raises(OverflowError):
+        s.apply_lr(0, 2, 1 << 62)
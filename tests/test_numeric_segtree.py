@@ -0,0 +1,177 @@
+from atcoder import SegTree, SumSegTree, MinSegTree, MaxSegTree
+from random import randint
+import pytest
+
+
+KINDS = [
+    (SumSegTree, lambda a, b: a + b, lambda: 0),
+    (MinSegTree, min, lambda: (1 << 63) - 1),
+    (MaxSegTree, max, lambda: -(1 << 63)),
+]
+
+
+@pytest.mark.parametrize(("cls", "op", "e"), KINDS)
+def test_zero(cls, op, e):
+    assert e() == cls(0).all_prod()
+    assert e() == cls().all_prod()
+    assert e() == cls(v=[]).all_prod()
+
+
+@pytest.mark.parametrize(("cls", "op", "e"), KINDS)
+def test_invalid(cls, op, e):
+    with pytest.raises(AssertionError):
+        cls(n=-1)
+    s = cls(10)
+    with pytest.raises(AssertionError):
+        s.get(10)
+    with pytest.raises(AssertionError):
+        s.prod(3, 2)
+    with pytest.raises(AssertionError):
+        s.set(-1, 0)
+
+
+@pytest.mark.parametrize(("cls", "op", "e"), KINDS)
+def test_compare_segtree(cls, op, e):
+    for n in range(20):
+        v = [randint(-10**9, 10**9) for i in range(n)]
+        seg0 = SegTree(op, e, v=v)
+        seg1 = cls(v=v)
+        for _ in range(n):
+            p = randint(0, n - 1)
+            x = randint(-10**9, 10**9)
+            seg0.set(p, x)
+            seg1.set(p, x)
+        assert seg0.all_prod() == seg1.all_prod()
+        for left in range(n + 1):
+            for right in range(left, n + 1):
+                assert seg0.prod(left, right) == seg1.prod(left, right)
+        for i in range(n):
+            assert seg0.get(i) == seg1.get(i)
+        for left in range(n + 1):
+            for right in range(left, n + 1):
+                y = seg0.prod(left, right)
+
+                def f(x):
+                    return x == e() or x <= y if cls is not MinSegTree \
+                        else x >= y
+
+                assert seg0.max_right(left, f) == seg1.max_right(left, f)
+                assert seg0.min_left(right, f) == seg1.min_left(right, f)
+
+
+def test_overflow():
+    s = SumSegTree(2)
+    s.set(0, (1 << 63) - 1)
+    with pytest.raises(OverflowError):
+        s.set(1, 1)
+    assert [(1 << 63) - 1, 0] == [s.get(0), s.get(1)]
+    assert (1 << 63) - 1 == s.prod(0, 2) == s.all_prod()
+    assert 0 == s.prod(1, 2)
+    with pytest.raises(OverflowError):
+        s.set(1, 1 << 63)
+    assert 0 == s.get(1)
+    assert (1 << 63) - 1 == s.all_prod()
+
+
+@pytest.mark.parametrize(("cls", "op", "e"), KINDS)
+def test_set_many(cls, op, e):
+    for n in range(1, 40):
+        v = [randint(-10**9, 10**9) for i in range(n)]
+        seg0 = SegTree(op, e, v=v)
+        seg1 = cls(v=v)
+        for _ in range(5):
+            k = randint(0, 2 * n)
+            ps = [randint(0, n - 1) for _ in range(k)]
+            xs = [randint(-10**9, 10**9) for _ in range(k)]
+            seg0.set_many(ps, xs)
+            seg1.set_many(ps, xs)
+            for left in range(n + 1):
+                for right in range(left, n + 1):
+                    assert seg0.prod(left, right) == seg1.prod(left, right)
+
+
+@pytest.mark.parametrize(("cls", "op", "e"), KINDS)
+def test_set_many_invalid(cls, op, e):
+    s = cls(v=[1, 2, 3, 4])
+    with pytest.raises(AssertionError):
+        s.set_many([0, 9], [100, 5])
+    with pytest.raises(AssertionError):
+        s.set_many([0, 1], [100])
+    assert [1, 2, 3, 4] == [s.get(i) for i in range(4)]
+    assert op(op(1, 2), op(3, 4)) == s.all_prod()
+
+
+def test_set_many_overflow():
+    m = (1 << 63) - 1
+    s = SumSegTree(v=[m, 0, 0, 0])
+    with pytest.raises(OverflowError):
+        s.set_many([3, 1], [5, 1])
+    with pytest.raises(OverflowError):
+        s.set_many([2], [1 << 63])
+    assert [m, 0, 0, 0] == [s.get(i) for i in range(4)]
+    assert 0 == s.prod(2, 4)
+    assert m == s.prod(0, 2) == s.all_prod()
+    s.set_many([0, 3, 1], [-1, 5, 1])
+    assert [-1, 1, 0, 5] == [s.get(i) for i in range(4)]
+    assert 5 == s.all_prod()
+
+
+@pytest.mark.parametrize(("cls", "op", "e"), KINDS)
+def test_build_without_numpy(cls, op, e, monkeypatch):
+    import atcoder.segtree
+    v = [randint(-10**9, 10**9) for i in range(100)]
+    seg0 = cls(v=v)
+    monkeypatch.setattr(atcoder.segtree, "np", None)
+    seg1 = cls(v=v)
+    assert seg0._d == seg1._d
+
+
+def test_build_overflow():
+    s = SumSegTree(v=[(1 << 62), (1 << 62) - 1])
+    assert s.all_prod() == (1 << 63) - 1
+    with pytest.raises(OverflowError):
+        SumSegTree(v=[(1 << 62), (1 << 62)])
+    with pytest.raises(OverflowError):
+        SumSegTree(v=[-(1 << 63), -1])
+
+
+@pytest.mark.parametrize(("cls", "op", "e"), KINDS)
+@pytest.mark.parametrize("use_np", [False, True])
+def test_prod_many(cls, op, e, use_np, monkeypatch):
+    import atcoder.segtree
+    if use_np:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(atcoder.segtree, "np", None)
+    for n in range(20):
+        v = [randint(-10**9, 10**9) for i in range(n)]
+        seg = cls(v=v)
+        lefts = []
+        rights = []
+        for left in range(n + 1):
+            for right in range(left, n + 1):
+                lefts.append(left)
+                rights.append(right)
+        assert seg.prod_many(lefts, rights) == \
+            [seg.prod(left, right) for left, right in zip(lefts, rights)]
+        assert seg.prod_many([], []) == []
+    with pytest.raises(AssertionError):
+        cls(10).prod_many([3], [2])
+    with pytest.raises(AssertionError):
+        cls(10).prod_many([0], [11])
+
+
+@pytest.mark.parametrize("use_np", [False, True])
+def test_prod_many_overflow(use_np, monkeypatch):
+    import atcoder.segtree
+    if use_np:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(atcoder.segtree, "np", None)
+    m = (1 << 63) - 1
+    s = SumSegTree(v=[-m, m, m, -m])
+    lefts = [1, 0, 0, 1, 2]
+    rights = [3, 4, 2, 2, 4]
+    assert [2 * m, 0, 0, m, 0] == s.prod_many(lefts, rights)
+    assert s.prod_many(lefts, rights) == \
+        [s.prod(left, right) for left, right in zip(lefts, rights)]
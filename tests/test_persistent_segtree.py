@@ -0,0 +1,72 @@
+from atcoder import PersistentSegTree
+from random import randint
+import pytest
+
+
+def op(a, b):
+    assert a == '$' or b == '$' or a <= b
+    if a == '$':
+        return b
+    if b == '$':
+        return a
+    return a+b
+
+
+def e():
+    return '$'
+
+
+def test_zero():
+    s = PersistentSegTree(op, e, 0)
+    assert '$' == s.all_prod(0)
+    assert '$' == s.prod(0, 0, 0)
+    s = PersistentSegTree(op, e)
+    assert 1 == s.versions()
+
+
+def test_invalid():
+    s = PersistentSegTree(op, e, 10)
+    with pytest.raises(AssertionError):
+        s.get(0, 10)
+    with pytest.raises(AssertionError):
+        s.get(1, 0)
+    with pytest.raises(AssertionError):
+        s.prod(0, 3, 2)
+    with pytest.raises(AssertionError):
+        s.set(0, -1, 'a')
+    with pytest.raises(AssertionError):
+        PersistentSegTree(op, e, n=-1)
+
+
+def test_compare_naive():
+    for n in range(1, 20):
+        v = [chr(ord('a') + i) if randint(0, 1) else '$' for i in range(n)]
+        s = PersistentSegTree(op, e, v=v)
+        history = [v]
+        for _ in range(30):
+            version = randint(0, len(history) - 1)
+            p = randint(0, n - 1)
+            x = chr(ord('a') + p) if randint(0, 1) else '$'
+            w = history[version][:]
+            w[p] = x
+            assert len(history) == s.set(version, p, x)
+            history.append(w)
+        assert len(history) == s.versions()
+        for version, w in enumerate(history):
+            assert (''.join(w).replace('$', '') or '$') == s.all_prod(version)
+            for i in range(n):
+                assert w[i] == s.get(version, i)
+            for left in range(n + 1):
+                for right in range(left, n + 1):
+                    y = ''.join(w[left:right]).replace('$', '') or '$'
+                    assert y == s.prod(version, left, right)
+
+
+def test_node_count():
+    n = 1000
+    s = PersistentSegTree(lambda a, b: a + b, lambda: 0, n)
+    for i in range(100):
+        s.set(i, i, i)
+    assert len(s._d) == 2 * 1024 + 100 * 11
+    assert sum(range(100)) == s.all_prod(100)
+    assert sum(range(50)) == s.prod(50, 0, n)
@@ -162,3 +162,47 @@ def test_compare_naive():
 def test_assign():
     seg0 = seg()
     seg0 = seg(10)
+
+
+def test_set_many():
+    for n in range(30):
+        seg0 = seg_naive(n=n)
+        seg1 = seg(n=n)
+        ps = list(range(n))[::-1] + list(range(0, n, 3))
+        xs = [chr(ord('a') + p) for p in ps]
+        for p, x in zip(ps, xs):
+            seg0.set(p, x)
+        seg1.set_many(ps, xs)
+        for l in range(n+1):
+            for r in range(l, n+1):
+                assert seg0.prod(l, r) == seg1.prod(l, r)
+
+
+def test_set_many_invalid():
+    s = seg(10)
+    with pytest.raises(AssertionError):
+        s.set_many([10], ['a'])
+    with pytest.raises(AssertionError):
+        s.set_many([0, 1], ['a'])
+    with pytest.raises(AssertionError):
+        s.set_many([0, 10], ['a', 'b'])
+    for i in range(10):
+        assert '$' == s.get(i)
+    assert '$' == s.all_prod()
+
+
+def test_prod_many():
+    for n in range(30):
+        seg0 = seg(n=n)
+        for i in range(n):
+            seg0.set(i, chr(ord('a') + i))
+        lefts = []
+        rights = []
+        for l in range(n+1):
+            for r in range(l, n+1):
+                lefts.append(l)
+                rights.append(r)
+        assert seg0.prod_many(lefts, rights) == \
+            [seg0.prod(l, r) for l, r in zip(lefts, rights)]
+    with pytest.raises(AssertionError):
+        seg(10).prod_many([3], [2])
@@ -0,0 +1,74 @@
+from atcoder import SegTreeBeats
+from random import randint
+import pytest
+
+
+def test_zero():
+    s = SegTreeBeats(0)
+    assert 0 == s.sum(0, 0)
+    s = SegTreeBeats()
+    assert float('-inf') == s.max(0, 0)
+    assert float('inf') == s.min(0, 0)
+
+
+def test_invalid():
+    with pytest.raises(AssertionError):
+        SegTreeBeats(n=-1)
+    s = SegTreeBeats(10)
+    with pytest.raises(AssertionError):
+        s.get(10)
+    with pytest.raises(AssertionError):
+        s.sum(3, 2)
+    with pytest.raises(AssertionError):
+        s.chmin(0, 11, 0)
+
+
+def test_compare_naive():
+    for n in range(1, 30):
+        v = [randint(-100, 100) for _ in range(n)]
+        s = SegTreeBeats(v=v)
+        for _ in range(300):
+            ty = randint(0, 5)
+            left = randint(0, n)
+            right = randint(left, n)
+            x = randint(-100, 100)
+            if ty == 0:
+                s.chmin(left, right, x)
+                for i in range(left, right):
+                    v[i] = min(v[i], x)
+            elif ty == 1:
+                s.chmax(left, right, x)
+                for i in range(left, right):
+                    v[i] = max(v[i], x)
+            elif ty == 2:
+                s.add(left, right, x)
+                for i in range(left, right):
+                    v[i] += x
+            elif ty == 3:
+                p = randint(0, n - 1)
+                s.set(p, x)
+                v[p] = x
+            elif ty == 4:
+                p = randint(0, n - 1)
+                assert v[p] == s.get(p)
+            else:
+                assert sum(v[left:right]) == s.sum(left, right)
+                if left < right:
+                    assert max(v[left:right]) == s.max(left, right)
+                    assert min(v[left:right]) == s.min(left, right)
+        for i in range(n):
+            assert v[i] == s.get(i)
+
+
+def test_large():
+    n = 1 << 12
+    v = [randint(0, 10**9) for _ in range(n)]
+    s = SegTreeBeats(v=v)
+    s.chmin(0, n, 10**8)
+    s.add(n // 2, n, 10**9)
+    s.chmax(0, n, 5 * 10**8)
+    v = [max(min(x, 10**8) + (10**9 if i >= n // 2 else 0), 5 * 10**8)
+         for i, x in enumerate(v)]
+    assert sum(v) == s.sum(0, n)
+    assert max(v) == s.max(0, n)
+    assert min(v) == s.min(0, n)
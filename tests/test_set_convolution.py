@@ -0,0 +1,54 @@
+from atcoder import SetConvolution
+from random import randint
+import pytest
+
+
+MOD = 998244353
+
+
+def naive(a, b, op):
+    n = max(len(a), len(b))
+    n = 1 << (n - 1).bit_length()
+    c = [0] * n
+    for i in range(len(a)):
+        for j in range(len(b)):
+            k = op(i, j)
+            if k is not None:
+                c[k] = (c[k] + a[i] * b[j]) % MOD
+    return c
+
+
+def subset(i, j):
+    return i | j if i & j == 0 else None
+
+
+@pytest.fixture(params=[True, False])
+def use_numpy(request, monkeypatch):
+    import atcoder.set_convolution
+    if request.param:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(atcoder.set_convolution, 'np', None)
+    return request.param
+
+
+@pytest.mark.parametrize(("n", "m"), [(1, 1), (2, 2), (5, 8), (64, 64),
+                                      (100, 3)])
+def test_set_convolution(use_numpy, n, m):
+    conv = SetConvolution(MOD)
+    assert conv._use_np == use_numpy
+    a = [randint(0, MOD - 1) for i in range(n)]
+    b = [randint(-MOD, MOD) for i in range(m)]
+    assert naive(a, b, lambda i, j: i ^ j) == conv.xor_convolution(a, b)
+    assert naive(a, b, lambda i, j: i | j) == conv.or_convolution(a, b)
+    assert naive(a, b, lambda i, j: i & j) == conv.and_convolution(a, b)
+    assert naive(a, b, subset) == conv.subset_convolution(a, b)
+
+
+def test_set_convolution_empty(use_numpy):
+    conv = SetConvolution(MOD)
+    assert [] == conv.xor_convolution([], [])
+    assert [] == conv.or_convolution([], [])
+    assert [] == conv.and_convolution([], [])
+    assert [] == conv.subset_convolution([], [])
+    assert [0, 0] == conv.xor_convolution([], [1, 2])
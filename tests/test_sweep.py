@@ -0,0 +1,47 @@
+from atcoder import rectangle_union_area, max_overlap
+from random import randint
+
+
+def naive(x1, y1, x2, y2):
+    cnt = {}
+    for a, b, c, d in zip(x1, y1, x2, y2):
+        for x in range(a, c):
+            for y in range(b, d):
+                cnt[x, y] = cnt.get((x, y), 0) + 1
+    return len(cnt), max(cnt.values(), default=0)
+
+
+def test_empty():
+    assert 0 == rectangle_union_area([], [], [], [])
+    assert 0 == max_overlap([], [], [], [])
+    assert 0 == rectangle_union_area([1], [1], [1], [5])
+    assert 0 == max_overlap([1], [1], [5], [1])
+
+
+def test_simple():
+    x1 = [0, 1, 2]
+    y1 = [0, 1, 2]
+    x2 = [2, 3, 4]
+    y2 = [2, 3, 4]
+    assert 10 == rectangle_union_area(x1, y1, x2, y2)
+    assert 2 == max_overlap(x1, y1, x2, y2)
+    # 辺で接するだけの長方形は重ならない
+    assert 1 == max_overlap([0, 1], [0, 0], [1, 2], [1, 1])
+    assert 2.5 == rectangle_union_area([0, 0.5], [0, 0], [1.5, 2.5],
+                                       [1, 1])
+
+
+def test_compare_naive():
+    for _ in range(200):
+        k = randint(1, 10)
+        x1, y1, x2, y2 = [], [], [], []
+        for _ in range(k):
+            a, c = sorted((randint(-5, 5), randint(-5, 5)))
+            b, d = sorted((randint(-5, 5), randint(-5, 5)))
+            x1.append(a)
+            y1.append(b)
+            x2.append(c)
+            y2.append(d)
+        area, overlap = naive(x1, y1, x2, y2)
+        assert area == rectangle_union_area(x1, y1, x2, y2)
+        assert overlap == max_overlap(x1, y1, x2, y2)